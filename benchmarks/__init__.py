@@ -0,0 +1,4 @@
+"""Benchmarks for the sanitana_eden integration.
+
+Run with ``scripts/benchmark`` from the root of the repository.
+"""
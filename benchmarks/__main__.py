@@ -0,0 +1,346 @@
+"""Benchmark the sanitana_eden integration against a simulated device.
+
+Measures, for every platform, the latency from a device push to the state
+write, the rate of state writes under a scripted or recorded push stream and
+the round trip time of commands. Also checks that the steam heat-up model
+learns the rate of steady heat-up ramps.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from collections.abc import Callable
+import logging
+from math import floor
+from pathlib import Path
+import tempfile
+from time import monotonic
+from typing import Any
+
+from homeassistant.core import State
+
+from custom_components.sanitana_eden.const import HUB_POLL_INTERVAL
+from custom_components.sanitana_eden.steam import SanitanaEdenHeatUpModel
+
+from .harness import (
+    NAME,
+    StateWriteRecorder,
+    async_add_entry,
+    async_start_hass,
+    summarize,
+)
+from .replay import async_replay, load_recording
+from .simulator import (
+    BLUETOOTH_ON,
+    IDLE,
+    LIGHT_RED,
+    RADIO_ON,
+    SCENARIOS,
+    STEAM_REMAINING,
+    STEAM_TEMPERATURE,
+    SimulatedEden,
+)
+
+MANIFEST = (
+    Path(__file__).parent.parent / "custom_components/sanitana_eden/manifest.json"
+)
+TIMEOUT = 5.0
+
+OBJECT_ID = NAME.lower()
+LIGHT = f"light.{OBJECT_ID}"
+RADIO = f"switch.{OBJECT_ID}_radio"
+BLUETOOTH = f"switch.{OBJECT_ID}_bluetooth"
+VOLUME = f"number.{OBJECT_ID}_radio_volume"
+CLIMATE = f"climate.{OBJECT_ID}"
+TIME_REMAINING = f"sensor.{OBJECT_ID}_steam_time_remaining"
+
+STEAM_ON = {STEAM_TEMPERATURE: 20, STEAM_REMAINING: 1024}
+STEAM_OFF = {STEAM_TEMPERATURE: 0, STEAM_REMAINING: 0}
+# Pushes alternating between two states, each one changing the entity
+PUSH_PROBES: tuple[tuple[str, str, tuple[dict[int, int], ...]], ...] = (
+    ("light", LIGHT, ({LIGHT_RED: 255}, {LIGHT_RED: 0})),
+    ("switch", BLUETOOTH, ({BLUETOOTH_ON: 1}, {BLUETOOTH_ON: 0})),
+    # The entities with a write policy write a change of their discrete
+    # state right away: the radio turning on or off for the volume, the HVAC
+    # mode for the climate entity and the countdown starting or stopping
+    ("number", VOLUME, ({RADIO_ON: 1}, {RADIO_ON: 0})),
+    ("climate", CLIMATE, (STEAM_ON, STEAM_OFF)),
+    ("sensor", TIME_REMAINING, (STEAM_ON, STEAM_OFF)),
+)
+
+
+async def _async_push_latency(
+    sim: SimulatedEden,
+    recorder: StateWriteRecorder,
+    changes: dict[int, int],
+    entity_id: str,
+) -> float:
+    for index, value in changes.items():
+        sim.state[index] = value
+    written = recorder.wait_for(entity_id)
+    sent = sim.push()
+    return await asyncio.wait_for(written, TIMEOUT) - sent
+
+
+async def async_push_latency(
+    sim: SimulatedEden, recorder: StateWriteRecorder, count: int
+) -> dict[str, Any]:
+    """Measure the latency from a device push to the state write.
+
+    The entities with a write policy are measured on changes of their
+    discrete state, changes of their continuous value are held back on
+    purpose.
+    """
+    results = {}
+    for platform, entity_id, states in PUSH_PROBES:
+        sim.state[:] = IDLE
+        sim.push()
+        await asyncio.sleep(0.1)
+        samples = []
+        for index in range(count):
+            samples.append(
+                await _async_push_latency(
+                    sim, recorder, states[index % len(states)], entity_id
+                )
+            )
+        results[platform] = summarize(samples)
+    sim.state[:] = IDLE
+    sim.push()
+    return results
+
+
+async def async_write_rate(
+    sim: SimulatedEden,
+    recorder: StateWriteRecorder,
+    scenario: str,
+    rate: float,
+    duration: float,
+) -> dict[str, Any]:
+    """Measure the state writes caused by a scripted push stream."""
+    writes = recorder.writes
+    start = monotonic()
+    pushes = await sim.async_play(SCENARIOS[scenario](int(rate * duration)), rate)
+    await asyncio.sleep(0.5)
+    elapsed = monotonic() - start
+    writes = recorder.writes - writes
+    return {
+        "scenario": scenario,
+        "pushes": pushes,
+        "writes": writes,
+        "writes_per_second": round(writes / elapsed, 1),
+        "writes_per_push": round(writes / pushes, 2) if pushes else 0.0,
+    }
+
+
+async def async_replay_write_rate(
+    sim: SimulatedEden, recorder: StateWriteRecorder, path: Path, speed: float
+) -> dict[str, Any]:
+    """Measure the state writes caused by a recorded push stream."""
+    writes = recorder.writes
+    start = monotonic()
+    pushes = await async_replay(sim, load_recording(path), speed)
+    await asyncio.sleep(0.5)
+    elapsed = monotonic() - start
+    writes = recorder.writes - writes
+    return {
+        "recording": path.name,
+        "speed": speed,
+        "pushes": pushes,
+        "writes": writes,
+        "writes_per_second": round(writes / elapsed, 1),
+        "writes_per_push": round(writes / pushes, 2) if pushes else 0.0,
+    }
+
+
+async def _async_command_rtt(
+    hass: Any,
+    sim: SimulatedEden,
+    recorder: StateWriteRecorder,
+    domain: str,
+    service: str,
+    data: dict[str, Any],
+    cmd: bytes,
+    predicate: Callable[[State], bool],
+) -> tuple[float, float]:
+    received: asyncio.Future[float] = hass.loop.create_future()
+
+    def _listener(command: bytes, _args: tuple[int, ...]) -> None:
+        if command == cmd and not received.done():
+            received.set_result(monotonic())
+
+    sim.command_listeners.append(_listener)
+    written = recorder.wait_for(data["entity_id"], predicate)
+    try:
+        start = monotonic()
+        await hass.services.async_call(domain, service, data, blocking=True)
+        sent = await asyncio.wait_for(received, TIMEOUT)
+        return sent - start, await asyncio.wait_for(written, TIMEOUT) - start
+    finally:
+        sim.command_listeners.remove(_listener)
+
+
+def _state_is(value: str) -> Callable[[State], bool]:
+    return lambda state: state.state == value
+
+
+def _rgb_is(rgb_color: tuple[int, int, int]) -> Callable[[State], bool]:
+    return lambda state: state.attributes.get("rgb_color") == rgb_color
+
+
+async def async_command_rtt(
+    hass: Any, sim: SimulatedEden, recorder: StateWriteRecorder, count: int
+) -> dict[str, Any]:
+    """Measure the time from a service call to the device and to the state write.
+
+    The state write of a number is its optimistic value, written when the
+    value is set, so its round trip doesn't wait for the device to echo it.
+    """
+    sim.state[:] = IDLE
+    sim.push()
+    await asyncio.sleep(0.5)
+
+    results = {}
+    for domain, cmd, calls in (
+        (
+            "light",
+            b"m",
+            [
+                ("turn_on", {"entity_id": LIGHT, "rgb_color": [255, 0, 0]}),
+                ("turn_on", {"entity_id": LIGHT, "rgb_color": [0, 0, 255]}),
+            ],
+        ),
+        (
+            "switch",
+            b"j",
+            [("turn_on", {"entity_id": RADIO}), ("turn_off", {"entity_id": RADIO})],
+        ),
+        (
+            "number",
+            b"j",
+            [
+                ("set_value", {"entity_id": VOLUME, "value": 20}),
+                ("set_value", {"entity_id": VOLUME, "value": 30}),
+            ],
+        ),
+        (
+            "climate",
+            b"n",
+            [
+                ("set_hvac_mode", {"entity_id": CLIMATE, "hvac_mode": "heat"}),
+                ("set_hvac_mode", {"entity_id": CLIMATE, "hvac_mode": "off"}),
+            ],
+        ),
+    ):
+        sent_samples = []
+        rtt_samples = []
+        for index in range(count):
+            service, data = calls[index % len(calls)]
+            if "rgb_color" in data:
+                predicate = _rgb_is(tuple(data["rgb_color"]))
+            elif "value" in data:
+                predicate = _state_is(str(float(data["value"])))
+            elif "hvac_mode" in data:
+                predicate = _state_is(data["hvac_mode"])
+            else:
+                predicate = _state_is(service.removeprefix("turn_"))
+            sent, rtt = await _async_command_rtt(
+                hass, sim, recorder, domain, service, data, cmd, predicate
+            )
+            sent_samples.append(sent)
+            rtt_samples.append(rtt)
+        results[domain] = {
+            "to_device": summarize(sent_samples),
+            "round_trip": summarize(rtt_samples),
+        }
+    return results
+
+
+def heat_up_rates(rates: tuple[float, ...] = (0.25, 0.5, 1.0, 2.0)) -> dict[str, Any]:
+    """Learn steady heat-up ramps, return the rate learned from each.
+
+    The temperatures are pushed at the poll interval of a steaming device and
+    in whole degrees, like the device reports them.
+    """
+    results = {}
+    for rate in rates:
+        model = SanitanaEdenHeatUpModel()
+        now = 0.0
+        temperature = 21.0
+        while temperature < 45.0:
+            temperature = floor(21.5 + rate * now / 60.0)
+            model.update(True, temperature, 45.0, now)
+            now += HUB_POLL_INTERVAL
+        model.update(False, temperature, 45.0, now)
+        results[str(rate)] = {
+            "learned": round(model.rate, 3) if model.rate else None,
+            "error": round(abs(model.rate - rate) / rate, 3) if model.rate else None,
+        }
+    return results
+
+
+async def async_main(args: argparse.Namespace) -> dict[str, Any]:
+    """Run the benchmarks."""
+    sim = SimulatedEden()
+    port = await sim.async_start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = await async_start_hass(config_dir)
+        recorder = StateWriteRecorder(hass)
+        try:
+            connected = recorder.wait_for(
+                LIGHT, lambda state: state.state != "unavailable"
+            )
+            await async_add_entry(hass, port)
+            await asyncio.wait_for(connected, TIMEOUT * 4)
+
+            results: dict[str, Any] = {
+                "version": json.loads(MANIFEST.read_text())["version"],
+                "push_latency": await async_push_latency(sim, recorder, args.count),
+                "write_rate": await async_replay_write_rate(
+                    sim, recorder, args.replay, args.speed
+                )
+                if args.replay
+                else await async_write_rate(
+                    sim, recorder, args.scenario, args.rate, args.duration
+                ),
+                "command": await async_command_rtt(hass, sim, recorder, args.count),
+                "heat_up": heat_up_rates(),
+            }
+        finally:
+            await hass.async_stop(force=True)
+            await sim.async_stop()
+    return results
+
+
+def main() -> None:
+    """Parse arguments, run the benchmarks and report the results."""
+    parser = argparse.ArgumentParser(prog="scripts/benchmark", description=__doc__)
+    parser.add_argument("--count", type=int, default=50, help="samples per measurement")
+    parser.add_argument(
+        "--scenario", choices=sorted(SCENARIOS), default="mixed", help="push stream"
+    )
+    parser.add_argument("--rate", type=float, default=50.0, help="pushes per second")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds")
+    parser.add_argument(
+        "--replay", type=Path, help="push a recording instead of a scenario"
+    )
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="replay speed, 0 for as fast as possible",
+    )
+    parser.add_argument("--output", type=Path, help="write the results as JSON")
+    parser.add_argument("--debug", action="store_true", help="enable debug logging")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.DEBUG if args.debug else logging.ERROR)
+    results = asyncio.run(async_main(args))
+    report = json.dumps(results, indent=2)
+    if args.output:
+        args.output.write_text(report + "\n")
+    print(report)  # noqa: T201
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,131 @@
+"""Minimal Home Assistant instance running the integration for benchmarks."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+import json
+from pathlib import Path
+from statistics import quantiles
+from time import monotonic
+from typing import Any
+
+from homeassistant import bootstrap, config_entries, loader
+from homeassistant.core import CoreState, HomeAssistant, State
+from homeassistant.helpers.entity import Entity
+from homeassistant.setup import async_setup_component
+
+DOMAIN = "sanitana_eden"
+NAME = "Benchmark"
+MANIFEST = Path(__file__).parent.parent / f"custom_components/{DOMAIN}/manifest.json"
+
+
+async def async_start_hass(config_dir: str) -> HomeAssistant:
+    """Start a bare Home Assistant, without any of the default integrations."""
+    hass = HomeAssistant(config_dir)
+    hass.config.skip_pip = True
+    loader.async_setup(hass)
+    hass.config_entries = config_entries.ConfigEntries(hass, {})
+    if hasattr(bootstrap, "async_load_base_functionality"):
+        await bootstrap.async_load_base_functionality(hass)
+    else:
+        await hass.config_entries.async_initialize()
+        await bootstrap.load_registries(hass)
+    await async_setup_component(hass, "homeassistant", {})
+    # The benchmarks don't need the integrations the integration depends on,
+    # they are only marked as set up so it can be set up without them
+    hass.config.components.update(
+        json.loads(MANIFEST.read_text()).get("dependencies", [])
+    )
+    hass.state = CoreState.running
+    return hass
+
+
+async def async_add_entry(
+    hass: HomeAssistant, port: int, options: dict[str, Any] | None = None
+) -> config_entries.ConfigEntry:
+    """Add a config entry for a simulated device and wait for its entities."""
+    entry = config_entries.ConfigEntry(
+        version=0,
+        minor_version=1,
+        domain=DOMAIN,
+        title=NAME,
+        data={
+            "host": "127.0.0.1",
+            "port": port,
+            "name": NAME,
+            "mac_ap": "02:00:00:00:00:01",
+            "mac_sta": "02:00:00:00:00:02",
+        },
+        source=config_entries.SOURCE_USER,
+        unique_id="02:00:00:00:00:01",
+        options=options or {},
+    )
+    await hass.config_entries.async_add(entry)
+    await hass.async_block_till_done()
+    return entry
+
+
+@dataclass
+class _Waiter:
+    entity_id: str
+    predicate: Callable[[State], bool]
+    future: asyncio.Future[float]
+
+
+@dataclass
+class StateWriteRecorder:
+    """Count the state writes of the integration and wait for specific ones."""
+
+    hass: HomeAssistant
+    writes: int = 0
+    _waiters: list[_Waiter] = field(default_factory=list)
+
+    def __post_init__(self) -> None:
+        """Wrap the entity state writes to observe every write."""
+        states = self.hass.states
+        async_write_ha_state = Entity.async_write_ha_state
+        recorder = self
+
+        def _async_write_ha_state(entity: Entity) -> None:
+            async_write_ha_state(entity)
+            recorder.writes += 1
+            if not recorder._waiters:
+                return
+            now = monotonic()
+            entity_id = entity.entity_id
+            state = states.get(entity_id)
+            for waiter in list(recorder._waiters):
+                if (
+                    waiter.entity_id == entity_id
+                    and state is not None
+                    and waiter.predicate(state)
+                ):
+                    recorder._waiters.remove(waiter)
+                    if not waiter.future.done():
+                        waiter.future.set_result(now)
+
+        Entity.async_write_ha_state = _async_write_ha_state  # type: ignore[method-assign]
+
+    def wait_for(
+        self, entity_id: str, predicate: Callable[[State], bool] = lambda _: True
+    ) -> asyncio.Future[float]:
+        """Return a future resolving to the time of the next matching write."""
+        future: asyncio.Future[float] = self.hass.loop.create_future()
+        self._waiters.append(_Waiter(entity_id, predicate, future))
+        return future
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    """Return the count, median, 95th percentile and maximum of samples in ms."""
+    if not samples:
+        return {"count": 0}
+    ms = sorted(sample * 1000.0 for sample in samples)
+    # Inclusive, the exclusive method extrapolates beyond the maximum
+    p95 = quantiles(ms, n=20, method="inclusive")[-1] if len(ms) > 1 else ms[0]
+    return {
+        "count": len(ms),
+        "p50": round(ms[len(ms) // 2], 3),
+        "p95": round(p95, 3),
+        "max": round(ms[-1], 3),
+    }
@@ -0,0 +1,47 @@
+"""Replay of device updates recorded by the integration."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterator
+import json
+from pathlib import Path
+from time import monotonic
+
+from .simulator import SimulatedEden
+
+
+def load_recording(path: Path) -> Iterator[tuple[float, bool, list[int]]]:
+    """Return the time, availability and state of every recorded update.
+
+    Recordings are made with the sanitana_eden.start_recording service.
+    """
+    with path.open(encoding="utf-8") as file:
+        for line in file:
+            if line.strip():
+                update = json.loads(line)
+                yield update["t"], update["a"], update["s"]
+
+
+async def async_replay(
+    sim: SimulatedEden,
+    updates: Iterator[tuple[float, bool, list[int]]],
+    speed: float,
+) -> int:
+    """Push recorded states at their recorded times, return the number pushed.
+
+    With a speed of 0 states are pushed as fast as possible. Updates of an
+    unavailable device are skipped, the simulator stays connected.
+    """
+    start = monotonic()
+    count = 0
+    for offset, available, state in updates:
+        if not available:
+            continue
+        if speed > 0:
+            await asyncio.sleep(max(0.0, start + offset / speed - monotonic()))
+        else:
+            await asyncio.sleep(0)
+        sim.state[:] = state
+        sim.push()
+        count += 1
+    return count
@@ -0,0 +1,178 @@
+"""Simulated Sanitana Eden for benchmarks."""
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from time import monotonic
+
+HEADER = b"@" + b"11:22:33:44:55:66" + b"00:00:00:00:00:00"
+STATUS = b"o"
+
+# Indices in the status message, see aio_sanitana_eden.SanitanaEdenState
+RADIO_ON = 0
+RADIO_FREQUENCY = 1
+RADIO_VOLUME = 2
+BLUETOOTH_ON = 3
+LIGHT_RED = 4
+LIGHT_GREEN = 5
+LIGHT_BLUE = 6
+STEAM_TEMPERATURE = 7
+STEAM_REMAINING = 8
+
+IDLE = (0, 9530, 10, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+
+
+def encode(cmd: bytes, *args: int) -> bytes:
+    """Encode a message in the Sanitana Eden line protocol."""
+    return b"".join(
+        (
+            HEADER,
+            cmd,
+            b" " if args else b"",
+            b" ".join(str(a).encode("ascii") for a in args),
+            b"*&\n",
+        )
+    )
+
+
+def decode(data: bytes) -> tuple[bytes, tuple[int, ...]] | None:
+    """Decode a message in the Sanitana Eden line protocol."""
+    if data[0:1] != b"@" or data[-3:] != b"*&\n":
+        return None
+    return data[35:36], tuple(int(a) for a in data[36:-3].split())
+
+
+class SimulatedEden:
+    """TCP stand-in for a Sanitana Eden.
+
+    Applies radio, bluetooth, light and steam commands to its state and
+    answers every command and poll with a status message, like the device.
+    Scripted sequences of states can be pushed at a fixed rate.
+    """
+
+    def __init__(self, *, answer_polls: bool = True) -> None:
+        """Initialize."""
+        self.state: list[int] = list(IDLE)
+        self.answer_polls = answer_polls
+        self.commands: list[tuple[float, bytes, tuple[int, ...]]] = []
+        self.command_listeners: list[Callable[[bytes, tuple[int, ...]], None]] = []
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._handlers: set[asyncio.Task[None]] = set()
+        self._server: asyncio.Server | None = None
+
+    async def async_start(self, host: str = "127.0.0.1", port: int = 0) -> int:
+        """Start listening, return the port."""
+        self._server = await asyncio.start_server(self._handle, host, port)
+        return self._server.sockets[0].getsockname()[1]
+
+    async def async_stop(self) -> None:
+        """Disconnect all clients and stop listening."""
+        for writer in self._writers:
+            writer.close()
+        # Closing makes the handlers read the end of the stream and return
+        await asyncio.gather(*self._handlers, return_exceptions=True)
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    def push(self) -> float:
+        """Push the current state to all clients, return when it was sent."""
+        data = encode(STATUS, *self.state)
+        for writer in self._writers:
+            writer.write(data)
+        return monotonic()
+
+    async def async_play(self, states: Iterable[Sequence[int]], rate: float) -> int:
+        """Push a sequence of states at a fixed rate, return the number pushed."""
+        start = monotonic()
+        count = 0
+        for count, state in enumerate(states, 1):
+            self.state[:] = state
+            self.push()
+            await asyncio.sleep(max(0.0, start + count / rate - monotonic()))
+        return count
+
+    def _apply(self, cmd: bytes, args: tuple[int, ...]) -> None:
+        state = self.state
+        if cmd == b"j" and len(args) == 3:
+            state[RADIO_ON : RADIO_VOLUME + 1] = args
+        elif cmd == b"r" and len(args) == 1:
+            state[BLUETOOTH_ON] = args[0]
+        elif cmd == b"m" and len(args) == 3:
+            state[LIGHT_RED : LIGHT_BLUE + 1] = args
+        elif cmd == b"n" and len(args) == 2:
+            state[STEAM_TEMPERATURE] = args[0] and 20
+            state[STEAM_REMAINING] = 1024 if args[0] else 0
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        self._writers.add(writer)
+        if (handler := asyncio.current_task()) is not None:
+            self._handlers.add(handler)
+        try:
+            while data := await reader.readline():
+                if (message := decode(data)) is None:
+                    continue
+                cmd, args = message
+                if cmd != STATUS:
+                    self.commands.append((monotonic(), cmd, args))
+                    self._apply(cmd, args)
+                    for listener in self.command_listeners:
+                        listener(cmd, args)
+                if self.answer_polls or cmd != STATUS:
+                    writer.write(encode(STATUS, *self.state))
+        except ConnectionError:
+            pass
+        finally:
+            self._writers.discard(writer)
+            self._handlers.discard(handler)
+            writer.close()
+
+
+def light_ramp(count: int) -> Iterator[list[int]]:
+    """Return states ramping the red channel of the light."""
+    for index in range(count):
+        yield [0, 9530, 10, 0, index % 256, 0, 0, 0, 0, 0, 0, 0]
+
+
+def steam_session(count: int) -> Iterator[list[int]]:
+    """Return states of a steam session heating up and counting down."""
+    for index in range(count):
+        yield [
+            0,
+            9530,
+            10,
+            0,
+            0,
+            0,
+            0,
+            min(20 + index // 4, 45),
+            max(1024 - index, 1),
+            0,
+            0,
+            0,
+        ]
+
+
+def mixed(count: int) -> Iterator[list[int]]:
+    """Return states changing a different subsystem on every push."""
+    state = [0, 9530, 10, 0, 0, 0, 0, 30, 512, 0, 0, 0]
+    for index in range(count):
+        subsystem = index % 4
+        if subsystem == 0:
+            state[LIGHT_RED] = index % 256
+        elif subsystem == 1:
+            state[RADIO_VOLUME] = index % 64
+        elif subsystem == 2:
+            state[BLUETOOTH_ON] = index % 8 // 4
+        else:
+            state[STEAM_REMAINING] = 1024 - index % 1024
+        yield list(state)
+
+
+SCENARIOS: dict[str, Callable[[int], Iterator[list[int]]]] = {
+    "light_ramp": light_ramp,
+    "steam_session": steam_session,
+    "mixed": mixed,
+}
@@ -8,9 +8,17 @@ from __future__ import annotations
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
-from .const import DOMAIN
-from .coordinator import SanitanaEdenDataUpdateCoordinator
+from .const import DOMAIN, SIGNAL_TELEMETRY
+from .coordinator import (
+    SanitanaEdenDataUpdateCoordinator,
+    async_get_store,
+    entry_modules,
+)
+from .services import async_setup_services
+from .websocket import async_setup_websocket_api
 
 PLATFORMS: list[Platform] = [
     Platform.LIGHT,
@@ -19,12 +27,31 @@ PLATFORMS: list[Platform] = [
     Platform.SENSOR,
     Platform.CLIMATE,
 ]
+# The modules a platform has entities for, the sensors are always set up
+PLATFORM_MODULES: dict[Platform, set[str]] = {
+    Platform.LIGHT: {"light"},
+    Platform.SWITCH: {"radio", "bluetooth"},
+    Platform.NUMBER: {"radio", "steam"},
+    Platform.CLIMATE: {"steam"},
+}
+
+
+def _platforms(coordinator: SanitanaEdenDataUpdateCoordinator) -> list[Platform]:
+    """Return the platforms with entities for the modules of a device."""
+    return [
+        platform
+        for platform in PLATFORMS
+        if platform not in PLATFORM_MODULES
+        or PLATFORM_MODULES[platform] & coordinator.modules
+    ]
 
 
 # https://developers.home-assistant.io/docs/config_entries_index/#setting-up-an-entry
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up this integration using UI."""
     hass.data.setdefault(DOMAIN, {})
+    async_setup_services(hass)
+    async_setup_websocket_api(hass)
     coordinator = SanitanaEdenDataUpdateCoordinator(hass, entry)
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
@@ -33,23 +60,49 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
     await coordinator.async_config_entry_first_refresh()
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
+    platforms = _platforms(coordinator)
+    # Drop the entities of platforms left out, the platforms drop their own
+    registry = er.async_get(hass)
+    for entity in er.async_entries_for_config_entry(registry, entry.entry_id):
+        if entity.domain not in platforms:
+            registry.async_remove(entity.entity_id)
+    await hass.config_entries.async_forward_entry_setups(entry, platforms)
+    entry.async_on_unload(entry.add_update_listener(async_update_entry))
 
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Handle removal of an entry."""
-    if unloaded := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        coordinator: SanitanaEdenDataUpdateCoordinator
-        coordinator = hass.data[DOMAIN][entry.entry_id]
+    coordinator: SanitanaEdenDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    if unloaded := await hass.config_entries.async_unload_platforms(
+        entry, _platforms(coordinator)
+    ):
         await coordinator.async_shutdown()
         hass.data[DOMAIN].pop(entry.entry_id)
+        # Telemetry subscribers see the device unavailable until set up again
+        async_dispatcher_send(hass, SIGNAL_TELEMETRY.format(entry.entry_id))
     return unloaded
 
 
-async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
-    """Reload config entry."""
-    await async_unload_entry(hass, entry)
-    await async_setup_entry(hass, entry)
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove the stored state of a removed entry."""
+    await async_get_store(hass, entry.entry_id).async_remove()
+
+
+async def async_update_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Handle an update of the config entry.
+
+    Only a change of the device connection or of its modules needs a reload,
+    options are applied to the running coordinator.
+    """
+    coordinator: SanitanaEdenDataUpdateCoordinator | None
+    if (coordinator := hass.data[DOMAIN].get(entry.entry_id)) is None:
+        return
+    if (coordinator.host, coordinator.port) != (
+        entry.data["host"],
+        entry.data["port"],
+    ) or coordinator.modules != entry_modules(entry):
+        await hass.config_entries.async_reload(entry.entry_id)
+    else:
+        coordinator.async_update_options()
@@ -1,12 +1,16 @@
 """Climate platform for sanitana_eden."""
 from __future__ import annotations
 
+from collections.abc import Hashable
 from dataclasses import dataclass
+from datetime import datetime, timedelta
 from typing import Any
 
-from .const import DOMAIN
+import voluptuous as vol
+
+from .const import COMMAND_PRIORITY_STEAM, DOMAIN, LOGGER, SCHEDULED_START_GRACE
 from .coordinator import SanitanaEdenDataUpdateCoordinator
-from .entity import SanitanaEdenEntity
+from .entity import SanitanaEdenEntity, SanitanaEdenWritePolicy
 
 from homeassistant.components.climate import (
     ClimateEntityDescription,
@@ -20,14 +24,27 @@ from homeassistant.components.climate.const import (
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import ATTR_TEMPERATURE, UnitOfTemperature
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.entity_platform import (
+    AddEntitiesCallback,
+    async_get_current_platform,
+)
+from homeassistant.helpers.event import async_track_point_in_utc_time
+from homeassistant.util import dt as dt_util
+
+ATTR_AT = "at"
+SERVICE_START_STEAM_AT = "start_steam_at"
+
 
 @dataclass(kw_only=True, frozen=True)
 class SanitanaEdenClimateEntityDescription(ClimateEntityDescription):
     """Describes Sanitana Eden water heater entity."""
 
     has_entity_name: bool = True
+    subsystem: str = "steam"
+    write_policy: SanitanaEdenWritePolicy | None = None
 
 
 ENTITY_DESCRIPTIONS = (
@@ -35,6 +52,7 @@ ENTITY_DESCRIPTIONS = (
         key="sanitana_eden",
         name=None,
         translation_key="sanitana_eden",
+        write_policy=SanitanaEdenWritePolicy(min_interval=30.0, deadband=0.5),
     ),
 )
 
@@ -50,6 +68,19 @@ async def async_setup_entry(
     async_add_entities(
         SanitanaEdenClimateEntity(coordinator, entity_description)
         for entity_description in ENTITY_DESCRIPTIONS
+        if coordinator.has_module(entity_description.subsystem)
+    )
+
+    platform = async_get_current_platform()
+    platform.async_register_entity_service(
+        SERVICE_START_STEAM_AT,
+        {
+            vol.Required(ATTR_AT): cv.datetime,
+            vol.Optional(ATTR_TEMPERATURE): vol.All(
+                vol.Coerce(float), vol.Range(min=35.0, max=50.0)
+            ),
+        },
+        "async_start_steam_at",
     )
 
 
@@ -63,8 +94,9 @@ class SanitanaEdenClimateEntity(SanitanaEdenEntity, ClimateEntity):
         entity_description: SanitanaEdenClimateEntityDescription,
     ) -> None:
         """Initialize the climate class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_description.subsystem)
         self.entity_description = entity_description
+        self._write_policy = entity_description.write_policy
         self._attr_unique_id: str | None = coordinator.config_entry.unique_id
         if entity_description.name is not None and self._attr_unique_id is not None:
             self._attr_unique_id += "_" + entity_description.key
@@ -78,48 +110,160 @@ class SanitanaEdenClimateEntity(SanitanaEdenEntity, ClimateEntity):
             | ClimateEntityFeature.TURN_ON
             | ClimateEntityFeature.TURN_OFF
         )
+        self._unsub_scheduled_start: CALLBACK_TYPE | None = None
+
+    async def async_added_to_hass(self) -> None:
+        """Arm the scheduled start kept across reloads and restarts."""
+        await super().async_added_to_hass()
+        if (start := self.coordinator.scheduled_start) is None:
+            return
+        if start < dt_util.utcnow() - timedelta(seconds=SCHEDULED_START_GRACE):
+            LOGGER.warning(
+                "Missed the start of steam scheduled at %s for %s", start, self.name
+            )
+            self._async_cancel_scheduled_start()
+            return
+        # A start that just passed while not loaded is made right away
+        self._unsub_scheduled_start = async_track_point_in_utc_time(
+            self.hass, self._async_scheduled_start, start
+        )
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Disarm a scheduled start when removed, it is armed again when added."""
+        if self._unsub_scheduled_start is not None:
+            self._unsub_scheduled_start()
+            self._unsub_scheduled_start = None
+        await super().async_will_remove_from_hass()
+
+    @property
+    def _discrete_state(self) -> Hashable:
+        # Target temperature changes are made by users, don't hold them back
+        return (*super()._discrete_state, self.coordinator.data.steam.temperature)
+
+    @property
+    def _limited_value(self) -> float | None:
+        return self.coordinator.data.steam.current_temperature
 
     @property
     def current_temperature(self) -> float | None:
         """Return the current temperature."""
-        return self.coordinator.device.steam.current_temperature
+        return self.coordinator.data.steam.current_temperature
 
     @property
     def target_temperature(self) -> float | None:
         """Return the target temperature."""
-        return self.coordinator.device.steam.temperature
+        return self.coordinator.data.steam.temperature
 
     @property
     def hvac_mode(self) -> HVACMode | None:
         """Return current operation ie. eco, electric, performance, ..."""
-        return HVACMode.HEAT if self.coordinator.device.steam.is_on else HVACMode.OFF
+        return HVACMode.HEAT if self.coordinator.data.steam.is_on else HVACMode.OFF
 
     @property
     def hvac_action(self) -> HVACAction | None:
         """Return the current running hvac action."""
         return (
             HVACAction.HEATING
-            if self.coordinator.device.steam.is_on
+            if self.coordinator.data.steam.is_on
             else HVACAction.OFF
         )
 
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the heat-up predictions."""
+        steam = self.coordinator.data.steam
+        heat_up = self.coordinator.heat_up
+        rate = heat_up.heating_rate
+        time_to_target = (
+            heat_up.time_to_target(steam.current_temperature, steam.temperature)
+            if steam.is_on
+            else None
+        )
+        return {
+            "heating_rate": None if rate is None else round(rate, 2),
+            "time_to_target": None
+            if time_to_target is None
+            else round(time_to_target, 1),
+            "preheat_lead_time": round(heat_up.lead_time(steam.temperature), 1),
+            "scheduled_start": self.coordinator.scheduled_start,
+        }
+
+    async def async_start_steam_at(
+        self, at: datetime, temperature: float | None = None
+    ) -> None:
+        """Start steam in time for the cabin to be at temperature at a time."""
+        if temperature is not None:
+            await self.async_set_temperature(**{ATTR_TEMPERATURE: temperature})
+        self._async_cancel_scheduled_start()
+        lead_time = self.coordinator.heat_up.lead_time(
+            self.coordinator.device.steam.temperature
+        )
+        start = dt_util.as_utc(at) - timedelta(minutes=lead_time)
+        if start <= dt_util.utcnow():
+            await self.async_turn_on()
+            return
+        LOGGER.debug("Starting steam at %s to be at temperature at %s", start, at)
+        self.coordinator.scheduled_start = start
+        self.coordinator.async_save_state()
+        self._unsub_scheduled_start = async_track_point_in_utc_time(
+            self.hass, self._async_scheduled_start, start
+        )
+        self.async_write_ha_state()
+
+    async def _async_scheduled_start(self, _now: datetime) -> None:
+        self._unsub_scheduled_start = None
+        self.coordinator.scheduled_start = None
+        self.coordinator.async_save_state()
+        try:
+            await self.async_turn_on()
+        except HomeAssistantError as exception:
+            LOGGER.error(
+                "Failed to start steam of %s as scheduled: %s",
+                self.coordinator.config_entry.title,
+                exception,
+            )
+        self.async_write_ha_state()
+
+    @callback
+    def _async_cancel_scheduled_start(self) -> None:
+        if self._unsub_scheduled_start is not None:
+            self._unsub_scheduled_start()
+            self._unsub_scheduled_start = None
+        if self.coordinator.scheduled_start is not None:
+            self.coordinator.scheduled_start = None
+            self.coordinator.async_save_state()
+
     async def async_set_temperature(self, **kwargs: Any) -> None:
         """Set target temperature."""
         if temperature := kwargs.get(ATTR_TEMPERATURE):
-            await self.coordinator.device.steam.async_set_temperature(temperature)
-            self.async_schedule_update_ha_state()
+            await self.coordinator.async_set_steam_temperature(temperature)
 
     async def async_set_hvac_mode(self, /, hvac_mode: HVACMode) -> None:
         """Set target operation mode."""
         if hvac_mode == HVACMode.OFF and self.coordinator.device.steam.is_on:
-            await self.coordinator.device.steam.async_turn_off()
+            await self.coordinator.async_send_command(
+                "steam",
+                "steam",
+                lambda device: device.steam.async_turn_off(),
+                COMMAND_PRIORITY_STEAM,
+                confirm=lambda data: not data.steam.is_on,
+            )
         elif hvac_mode == HVACMode.HEAT and not self.coordinator.device.steam.is_on:
-            await self.coordinator.device.steam.async_turn_on()
+            await self.coordinator.async_send_command(
+                "steam",
+                "steam",
+                lambda device: device.steam.async_turn_on(),
+                COMMAND_PRIORITY_STEAM,
+                confirm=lambda data: data.steam.is_on,
+            )
 
     async def async_turn_on(self, **_) -> None:
         """Turn the entity on."""
         await self.async_set_hvac_mode(HVACMode.HEAT)
 
     async def async_turn_off(self, **_) -> None:
-        """Turn the entity off."""
+        """Turn the entity off, cancelling a scheduled start."""
+        if self.coordinator.scheduled_start is not None:
+            self._async_cancel_scheduled_start()
+            self.async_write_ha_state()
         await self.async_set_hvac_mode(HVACMode.OFF)
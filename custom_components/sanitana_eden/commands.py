@@ -0,0 +1,374 @@
+"""Device commands for sanitana_eden."""
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from math import isclose
+from time import monotonic
+from typing import TYPE_CHECKING, Any
+
+from aio_sanitana_eden import SanitanaEden
+from homeassistant.components.light import (
+    ATTR_BRIGHTNESS,
+    ATTR_RGB_COLOR,
+    ATTR_TRANSITION,
+)
+from homeassistant.core import callback
+from homeassistant.exceptions import HomeAssistantError
+
+from .const import (
+    COMMAND_BURST,
+    COMMAND_PRIORITY_ADJUST,
+    COMMAND_RATE,
+    LIGHT_COMMAND_WINDOW,
+    LIGHT_TRANSITION_FRAME_RATE,
+    LOGGER,
+)
+from .snapshot import SanitanaEdenSnapshot
+
+if TYPE_CHECKING:
+    from .coordinator import SanitanaEdenDataUpdateCoordinator
+
+
+class SanitanaEdenCommandScheduler:
+    """Send the commands for a device in order of priority.
+
+    Commands wait in a queue per priority class and the queues are drained
+    highest priority first, so steam commands never wait behind light or
+    radio traffic for longer than the command being sent. A command queued
+    under a key already waiting in its class supersedes the waiting one,
+    which completes as superseded without being sent. The send rate is capped by a token
+    bucket, which lets short bursts through without waiting. A command that
+    can't be sent because the link dropped fails with ConnectionError, so the
+    coordinator buffers it.
+    """
+
+    def __init__(
+        self,
+        coordinator: SanitanaEdenDataUpdateCoordinator,
+        rate: float = COMMAND_RATE,
+        burst: int = COMMAND_BURST,
+    ) -> None:
+        """Initialize."""
+        self.superseded = 0
+        self._coordinator = coordinator
+        self._rate = rate
+        self._burst = burst
+        self._tokens = float(burst)
+        self._updated = monotonic()
+        self._queues: list[
+            OrderedDict[
+                str,
+                tuple[Callable[[SanitanaEden], Awaitable[None]], asyncio.Future[bool]],
+            ]
+        ] = [OrderedDict() for _ in range(COMMAND_PRIORITY_ADJUST + 1)]
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def queued(self) -> int:
+        """Return the number of commands waiting to be sent."""
+        return sum(len(queue) for queue in self._queues)
+
+    async def async_send(
+        self,
+        priority: int,
+        key: str,
+        command: Callable[[SanitanaEden], Awaitable[None]],
+    ) -> bool:
+        """Queue a command and wait until it was sent or superseded.
+
+        Returns True if the command was sent, False if it was superseded.
+        """
+        future: asyncio.Future[bool] = self._coordinator.hass.loop.create_future()
+        queue = self._queues[priority]
+        if (waiting := queue.pop(key, None)) is not None:
+            self.superseded += 1
+            if not waiting[1].done():
+                waiting[1].set_result(False)
+        queue[key] = (command, future)
+        if self._task is None:
+            self._task = self._coordinator.hass.async_create_background_task(
+                self._async_run(), "sanitana_eden commands"
+            )
+        return await future
+
+    @callback
+    def async_cancel(self) -> None:
+        """Fail the waiting commands and stop sending."""
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for queue in self._queues:
+            for _, future in queue.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Shutting down"))
+            queue.clear()
+
+    def _pop(
+        self,
+    ) -> tuple[Callable[[SanitanaEden], Awaitable[None]], asyncio.Future[bool]] | None:
+        for queue in self._queues:
+            if queue:
+                return queue.popitem(last=False)[1]
+        return None
+
+    async def _async_run(self) -> None:
+        try:
+            while True:
+                now = monotonic()
+                self._tokens = min(
+                    self._tokens + (now - self._updated) * self._rate, self._burst
+                )
+                self._updated = now
+                if self._tokens < 1.0:
+                    await asyncio.sleep((1.0 - self._tokens) / self._rate)
+                    continue
+                # Pick after waiting, a more urgent command may have arrived
+                if (item := self._pop()) is None:
+                    return
+                command, future = item
+                if not self._coordinator.device.connected:
+                    # The link dropped while the command was waiting
+                    if not future.done():
+                        future.set_exception(ConnectionError("Not connected"))
+                    continue
+                self._tokens -= 1.0
+                try:
+                    await command(self._coordinator.device)
+                except asyncio.CancelledError:
+                    if not future.done():
+                        future.set_exception(ConnectionError("Shutting down"))
+                    raise
+                except (AssertionError, OSError) as exception:
+                    # The library asserts it has a writer, it's gone once the
+                    # link drops
+                    if not future.done():
+                        future.set_exception(ConnectionError(str(exception)))
+                except Exception as exception:
+                    if not future.done():
+                        future.set_exception(exception)
+                else:
+                    if not future.done():
+                        future.set_result(True)
+        finally:
+            self._task = None
+
+
+class SanitanaEdenCommandCoalescer:
+    """Coalesce the commands setting a single value on the device.
+
+    Values set within the debounce window are coalesced and only the last one
+    is sent. At most one command is in flight, values set in the meantime are
+    sent once the device echoed the previous one. Until the device echoed the
+    last value set, it is exposed as an optimistic value. It is rolled back if
+    the device doesn't echo it in time.
+    """
+
+    def __init__(
+        self,
+        coordinator: SanitanaEdenDataUpdateCoordinator,
+        key: str,
+        subsystem: str,
+        set_fn: Callable[[SanitanaEdenDataUpdateCoordinator, float], Awaitable[None]],
+        value_fn: Callable[[SanitanaEdenSnapshot], float],
+    ) -> None:
+        """Initialize."""
+        self.key = key
+        self.subsystem = subsystem
+        self.value: float | None = None
+        self._coordinator = coordinator
+        self._set_fn = set_fn
+        self._value_fn = value_fn
+        self._pending: float | None = None
+        self._timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @property
+    def busy(self) -> bool:
+        """Return True if a value is waiting to be sent or being sent."""
+        return self._timer is not None or self._task is not None
+
+    @callback
+    def async_set(self, value: float) -> None:
+        """Set a value, to be sent at the end of the debounce window."""
+        self.value = self._pending = value
+        if not self.busy:
+            self._timer = self._coordinator.hass.loop.call_later(
+                self._coordinator.command_debounce, self._async_start
+            )
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel any pending command."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._pending = self.value = None
+
+    @callback
+    def _async_start(self) -> None:
+        self._timer = None
+        self._task = self._coordinator.hass.async_create_background_task(
+            self._async_send(), f"sanitana_eden set {self.key}"
+        )
+
+    async def _async_send(self) -> None:
+        try:
+            while (value := self._pending) is not None:
+                self._pending = None
+                await self._coordinator.async_send_command(
+                    self.subsystem,
+                    self.key,
+                    lambda _, value=value: self._set_fn(self._coordinator, value),
+                    confirm=lambda data, value=value: isclose(
+                        self._value_fn(data), value, abs_tol=0.005
+                    ),
+                )
+            self.value = None
+            self._coordinator.async_update_listeners_for({self.subsystem})
+        except Exception as exception:
+            LOGGER.error("Failed to set %s: %s", self.key, exception)
+            self._pending = self.value = None
+            self._coordinator.async_update_listeners_for({self.subsystem})
+        finally:
+            self._task = None
+
+
+class SanitanaEdenLightCommandBuilder:
+    """Merge light commands into a single device write.
+
+    Turn on and turn off calls arriving within a short window are merged, so a
+    scene setting brightness and color results in one write. Transitions are
+    sent as a precomputed sequence of frames at a limited frame rate. A new
+    command supersedes any transition still running.
+
+    Every call returns a future that resolves once the write it was merged
+    into was sent, or fails with the error sending it. For a transition that
+    is the write of its first frame, a failure of a later frame is logged.
+    """
+
+    def __init__(self, coordinator: SanitanaEdenDataUpdateCoordinator) -> None:
+        """Initialize."""
+        self._coordinator = coordinator
+        self._pending: dict[str, Any] | None = None
+        self._waiters: list[asyncio.Future[None]] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_turn_on(self, **kwargs: Any) -> asyncio.Future[None]:
+        """Turn the light on, merging with a pending turn on."""
+        pending = self._pending if self._pending and self._pending["on"] else {}
+        self._pending = {**pending, **kwargs, "on": True}
+        return self._async_schedule()
+
+    @callback
+    def async_turn_off(self, **kwargs: Any) -> asyncio.Future[None]:
+        """Turn the light off, replacing any pending command."""
+        self._pending = {**kwargs, "on": False}
+        return self._async_schedule()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Cancel any pending command or running transition."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        self._pending = None
+        _resolve(self._waiters, HomeAssistantError("Shutting down"))
+        self._waiters = []
+
+    @callback
+    def _async_schedule(self) -> asyncio.Future[None]:
+        future: asyncio.Future[None] = self._coordinator.hass.loop.create_future()
+        self._waiters.append(future)
+        if self._timer is None:
+            self._timer = self._coordinator.hass.loop.call_later(
+                LIGHT_COMMAND_WINDOW, self._async_start
+            )
+        return future
+
+    @callback
+    def _async_start(self) -> None:
+        self._timer = None
+        command, self._pending = self._pending, None
+        waiters, self._waiters = self._waiters, []
+        if command is None:
+            _resolve(waiters)
+            return
+        if self._task is not None:
+            self._task.cancel()
+        self._task = self._coordinator.hass.async_create_background_task(
+            self._async_send(command, waiters), "sanitana_eden light"
+        )
+
+    def _frames(self, command: dict[str, Any]) -> list[tuple[int, int, int]]:
+        """Return the frames to send for a command."""
+        light = self._coordinator.device.light
+        if command["on"]:
+            rgb_color = command.get(ATTR_RGB_COLOR) or light.rgb_color
+            brightness = command.get(ATTR_BRIGHTNESS) or light.brightness or 255
+            target = tuple(int(x * brightness / 255) for x in rgb_color)
+        else:
+            target = (0, 0, 0)
+
+        steps = round((command.get(ATTR_TRANSITION) or 0) * LIGHT_TRANSITION_FRAME_RATE)
+        if steps <= 1:
+            return [target]
+
+        start = tuple(int(x * light.brightness / 255) for x in light.rgb_color)
+        frames: list[tuple[int, int, int]] = []
+        for step in range(1, steps + 1):
+            frame = tuple(
+                round(s + (t - s) * step / steps) for s, t in zip(start, target)
+            )
+            if not frames or frames[-1] != frame:
+                frames.append(frame)
+        return frames
+
+    async def _async_send(
+        self, command: dict[str, Any], waiters: list[asyncio.Future[None]]
+    ) -> None:
+        try:
+            for index, frame in enumerate(self._frames(command)):
+                if index:
+                    _resolve(waiters)
+                    await asyncio.sleep(1.0 / LIGHT_TRANSITION_FRAME_RATE)
+                await self._coordinator.async_send_command(
+                    "light",
+                    "light",
+                    lambda device, frame=frame: device.light.async_turn_on(
+                        rgb_color=frame, brightness=255
+                    ),
+                )
+            _resolve(waiters)
+        except asyncio.CancelledError:
+            # Superseded by a newer command
+            _resolve(waiters)
+            raise
+        except Exception as exception:
+            if not _resolve(waiters, exception):
+                LOGGER.error("Failed to set light: %s", exception)
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+
+
+def _resolve(
+    futures: list[asyncio.Future[None]], exception: Exception | None = None
+) -> bool:
+    """Resolve the futures still pending, return True if there were any."""
+    pending = [future for future in futures if not future.done()]
+    for future in pending:
+        if exception is None:
+            future.set_result(None)
+        else:
+            future.set_exception(exception)
+    return bool(pending)
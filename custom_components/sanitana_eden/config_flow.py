@@ -2,19 +2,195 @@
 
 from __future__ import annotations
 
+import asyncio
 from collections import OrderedDict
 from dataclasses import asdict
-from typing import Any
+from ipaddress import ip_network
+from time import monotonic
+from typing import TYPE_CHECKING, Any
 
 import voluptuous as vol
 from aio_sanitana_eden import DeviceConnectionError, async_get_info, SanitanaEdenInfo
-from homeassistant.config_entries import ConfigFlow
+from homeassistant.config_entries import (
+    SOURCE_IMPORT,
+    ConfigEntry,
+    ConfigFlow,
+    OptionsFlow,
+)
 from homeassistant.const import CONF_HOST, CONF_NAME
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.data_entry_flow import FlowResult
+import homeassistant.helpers.config_validation as cv
 from homeassistant.helpers.device_registry import format_mac
 
 
-from .const import DOMAIN, NAME
+from .const import (
+    CONF_BACKOFF_INITIAL,
+    CONF_BACKOFF_MAX,
+    CONF_COMMAND_DEBOUNCE,
+    CONF_COUNTDOWN_INTERVAL,
+    CONF_MODULES,
+    CONF_PUSH_WINDOW,
+    CONF_TRACE,
+    CONF_UNAVAILABLE_GRACE,
+    CONF_WATCHDOG_TIMEOUT,
+    DATA_PROBES,
+    DEFAULT_BACKOFF_INITIAL,
+    DEFAULT_BACKOFF_MAX,
+    DEFAULT_COMMAND_DEBOUNCE,
+    DEFAULT_COUNTDOWN_INTERVAL,
+    DEFAULT_PUSH_WINDOW,
+    DEFAULT_UNAVAILABLE_GRACE,
+    DEFAULT_WATCHDOG_TIMEOUT,
+    DOMAIN,
+    LOGGER,
+    MODULES,
+    NAME,
+    PROBE_CACHE_TTL,
+    SCAN_CONCURRENCY,
+    SCAN_MAX_HOSTS,
+    SCAN_MESSAGE,
+    SCAN_PORT,
+    SCAN_TIMEOUT,
+)
+from .coordinator import entry_modules
+
+if TYPE_CHECKING:
+    from homeassistant.components.dhcp import DhcpServiceInfo
+
+CONF_DEVICES = "devices"
+CONF_HOSTS = "hosts"
+
+OPTIONS: dict[str, tuple[float, float, float]] = {
+    # option: (default, minimum, maximum)
+    CONF_COMMAND_DEBOUNCE: (DEFAULT_COMMAND_DEBOUNCE, 0.0, 5.0),
+    CONF_WATCHDOG_TIMEOUT: (DEFAULT_WATCHDOG_TIMEOUT, 10.0, 3600.0),
+    CONF_UNAVAILABLE_GRACE: (DEFAULT_UNAVAILABLE_GRACE, 0.0, 600.0),
+    CONF_BACKOFF_INITIAL: (DEFAULT_BACKOFF_INITIAL, 0.1, 60.0),
+    CONF_BACKOFF_MAX: (DEFAULT_BACKOFF_MAX, 1.0, 3600.0),
+    CONF_COUNTDOWN_INTERVAL: (DEFAULT_COUNTDOWN_INTERVAL, 1.0, 300.0),
+    CONF_PUSH_WINDOW: (DEFAULT_PUSH_WINDOW, 0.0, 1.0),
+}
+
+
+def _valid_info(info: SanitanaEdenInfo) -> bool:
+    """Return whether the info identifies a device that can be connected to."""
+    return not (info.mac_ap is None or info.mac_sta is None or info.port is None)
+
+
+def scan_hosts(value: str) -> list[str]:
+    """Expand a list of addresses and networks into a list of hosts."""
+    hosts: dict[str, None] = {}
+    for item in value.replace(",", " ").split():
+        try:
+            network = ip_network(item, strict=False)
+        except ValueError:
+            # A hostname
+            hosts[item] = None
+            continue
+        if network.num_addresses > SCAN_MAX_HOSTS:
+            raise ValueError(f"{item} has more than {SCAN_MAX_HOSTS} addresses")
+        for address in network.hosts():
+            hosts[str(address)] = None
+        if len(hosts) > SCAN_MAX_HOSTS:
+            raise ValueError(f"More than {SCAN_MAX_HOSTS} hosts to scan")
+    return list(hosts)
+
+
+class _ProbeProtocol(asyncio.DatagramProtocol):
+    """Wait for a host to answer the discovery message.
+
+    An ICMP error, such as the port being unreachable, resolves the probe
+    right away rather than being raised in the event loop.
+    """
+
+    def __init__(self, answered: asyncio.Future[bool]) -> None:
+        """Initialize."""
+        self._answered = answered
+
+    def datagram_received(self, data: bytes, addr: tuple[str, int]) -> None:
+        """Resolve the probe when the host answers."""
+        if not self._answered.done():
+            self._answered.set_result(True)
+
+    def error_received(self, exc: Exception) -> None:
+        """Resolve the probe when the host refuses."""
+        if not self._answered.done():
+            self._answered.set_result(False)
+
+    def connection_lost(self, exc: Exception | None) -> None:
+        """Resolve the probe when the socket closes."""
+        if not self._answered.done():
+            self._answered.set_result(False)
+
+
+async def async_probe(host: str) -> SanitanaEdenInfo | None:
+    """Probe a host, return the info of the device or None without one.
+
+    Only a host answering the discovery message is asked for its info, so
+    hosts without a device cost a single datagram.
+    """
+    loop = asyncio.get_running_loop()
+    answered: asyncio.Future[bool] = loop.create_future()
+    try:
+        transport, _ = await loop.create_datagram_endpoint(
+            lambda: _ProbeProtocol(answered), remote_addr=(host, SCAN_PORT)
+        )
+    except OSError:
+        return None
+    try:
+        transport.sendto(SCAN_MESSAGE)
+        async with asyncio.timeout(SCAN_TIMEOUT):
+            if not await answered:
+                return None
+    except TimeoutError:
+        return None
+    finally:
+        transport.close()
+    try:
+        async with asyncio.timeout(SCAN_TIMEOUT):
+            return await async_get_info(host)
+    except (DeviceConnectionError, TimeoutError):
+        return None
+
+
+async def async_probe_cached(
+    hass: HomeAssistant, host: str, mac: str
+) -> SanitanaEdenInfo | None:
+    """Probe a discovered host, reusing the recent result for its MAC address.
+
+    Devices announce themselves repeatedly, and other devices with a network
+    module of the same make share the MAC prefix. Results are cached, failed
+    probes included, so each of them is probed once in a while.
+    """
+    probes: dict[str, tuple[float, str, SanitanaEdenInfo | None]]
+    probes = hass.data.setdefault(DATA_PROBES, {})
+    now = monotonic()
+    if (probe := probes.get(mac)) is not None and probe[0] > now and probe[1] == host:
+        return probe[2]
+    info = await async_probe(host)
+    if info is not None and not _valid_info(info):
+        info = None
+    probes[mac] = (now + PROBE_CACHE_TTL, host, info)
+    return info
+
+
+async def async_scan(hosts: list[str]) -> dict[str, tuple[str, SanitanaEdenInfo]]:
+    """Probe hosts concurrently, return the devices found by MAC address."""
+
+    semaphore = asyncio.Semaphore(SCAN_CONCURRENCY)
+
+    async def _async_probe(host: str) -> SanitanaEdenInfo | None:
+        async with semaphore:
+            return await async_probe(host)
+
+    results = await asyncio.gather(*(_async_probe(host) for host in hosts))
+    devices: dict[str, tuple[str, SanitanaEdenInfo]] = {}
+    for host, info in zip(hosts, results):
+        if info is not None and _valid_info(info):
+            devices.setdefault(format_mac(info.mac_ap), (host, info))
+    LOGGER.debug("Found %d of %d hosts scanned", len(devices), len(hosts))
+    return devices
 
 
 class SanitanaEdenConfigFlow(ConfigFlow, domain=DOMAIN):
@@ -25,11 +201,25 @@ class SanitanaEdenConfigFlow(ConfigFlow, domain=DOMAIN):
 
     _name = ""
     _host = ""
+    _devices: dict[str, tuple[str, SanitanaEdenInfo]]
+    _info: SanitanaEdenInfo
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return SanitanaEdenOptionsFlow(config_entry)
 
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
         """Handle config step initiated by the user."""
+        return self.async_show_menu(step_id="user", menu_options=["manual", "scan"])
+
+    async def async_step_manual(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle a device entered by the user."""
 
         errors: dict[str, str] = {}
         if user_input is not None:
@@ -40,7 +230,7 @@ class SanitanaEdenConfigFlow(ConfigFlow, domain=DOMAIN):
             except DeviceConnectionError:
                 errors["base"] = "cannot_connect"
             else:
-                if info.mac_ap is None or info.mac_sta is None or info.port is None:
+                if not _valid_info(info):
                     errors["base"] = "cannot_connect"
                 else:
                     await self.async_set_unique_id(format_mac(info.mac_ap))
@@ -58,7 +248,199 @@ class SanitanaEdenConfigFlow(ConfigFlow, domain=DOMAIN):
         fields[vol.Required(CONF_HOST, default=self._host or vol.UNDEFINED)] = str  # type: ignore
 
         return self.async_show_form(
-            step_id="user",
+            step_id="manual",
+            data_schema=vol.Schema(fields),
+            errors=errors,
+        )
+
+    async def async_step_scan(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle scanning the network for devices."""
+
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            try:
+                hosts = scan_hosts(user_input[CONF_HOSTS])
+            except ValueError:
+                errors["base"] = "invalid_hosts"
+            else:
+                configured = self._async_current_ids()
+                self._devices = {
+                    mac: device
+                    for mac, device in (await async_scan(hosts)).items()
+                    if mac not in configured
+                }
+                if not self._devices:
+                    return self.async_abort(reason="no_devices_found")
+                return await self.async_step_scan_select()
+
+        return self.async_show_form(
+            step_id="scan",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(
+                        CONF_HOSTS, default=(user_input or {}).get(CONF_HOSTS, "")
+                    ): str
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_scan_select(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Handle selecting the devices found by a scan."""
+
+        errors: dict[str, str] = {}
+        if user_input is not None:
+            if not (macs := user_input[CONF_DEVICES]):
+                errors["base"] = "no_devices_selected"
+            else:
+                # This flow creates the first entry, import flows the others
+                for mac in macs[1:]:
+                    self.hass.async_create_task(
+                        self.hass.config_entries.flow.async_init(
+                            DOMAIN,
+                            context={"source": SOURCE_IMPORT},
+                            data=self._scan_entry_data(mac),
+                        )
+                    )
+                return await self.async_step_import(self._scan_entry_data(macs[0]))
+
+        devices = {
+            mac: f"{host} ({mac})" for mac, (host, _) in sorted(self._devices.items())
+        }
+        return self.async_show_form(
+            step_id="scan_select",
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_DEVICES, default=list(devices)): cv.multi_select(
+                        devices
+                    )
+                }
+            ),
+            errors=errors,
+        )
+
+    async def async_step_dhcp(self, discovery_info: DhcpServiceInfo) -> FlowResult:
+        """Handle a device discovered by DHCP.
+
+        A configured device that got a new address is updated in place.
+        """
+        host = discovery_info.ip
+        mac = format_mac(discovery_info.macaddress)
+        for entry in self._async_current_entries(include_ignore=False):
+            if mac in (
+                format_mac(entry.data["mac_ap"]),
+                format_mac(entry.data["mac_sta"]),
+            ):
+                if entry.data[CONF_HOST] != host:
+                    # The entry reloads when its host changes
+                    self.hass.config_entries.async_update_entry(
+                        entry, data={**entry.data, CONF_HOST: host}
+                    )
+                return self.async_abort(reason="already_configured")
+
+        if (info := await async_probe_cached(self.hass, host, mac)) is None:
+            return self.async_abort(reason="not_sanitana_eden")
+        await self.async_set_unique_id(format_mac(info.mac_ap))
+        self._abort_if_unique_id_configured(
+            updates={CONF_HOST: host}, reload_on_update=False
+        )
+        self._host = host
+        self._name = f"{NAME} {host}"
+        self._info = info
+        self.context["title_placeholders"] = {"name": self._name}
+        return await self.async_step_discovery_confirm()
+
+    async def async_step_discovery_confirm(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Confirm adding a discovered device."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title=self._name,
+                data={
+                    **asdict(self._info),
+                    CONF_NAME: self._name,
+                    CONF_HOST: self._host,
+                },
+            )
+
+        self._set_confirm_only()
+        return self.async_show_form(
+            step_id="discovery_confirm",
+            description_placeholders={"name": self._name, "host": self._host},
+        )
+
+    async def async_step_import(self, import_data: dict[str, Any]) -> FlowResult:
+        """Create an entry for a probed device."""
+        await self.async_set_unique_id(format_mac(import_data["mac_ap"]))
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(title=import_data[CONF_NAME], data=import_data)
+
+    def _scan_entry_data(self, mac: str) -> dict[str, Any]:
+        """Return the entry data for a device found by a scan."""
+        host, info = self._devices[mac]
+        return {**asdict(info), CONF_NAME: f"{NAME} {host}", CONF_HOST: host}
+
+
+class SanitanaEdenOptionsFlow(OptionsFlow):
+    """Handle Sanitana Eden options.
+
+    Changing the host reloads the entry, other options are applied to the
+    running integration.
+    """
+
+    def __init__(self, config_entry: ConfigEntry) -> None:
+        """Initialize."""
+        self.config_entry = config_entry
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+
+        errors: dict[str, str] = {}
+        entry = self.config_entry
+        defaults: dict[str, Any] = {
+            CONF_HOST: entry.data[CONF_HOST],
+            **{option: default for option, (default, _, _) in OPTIONS.items()},
+            CONF_TRACE: False,
+            **entry.options,
+            CONF_MODULES: sorted(entry_modules(entry)),
+        }
+        if user_input is not None:
+            host = user_input[CONF_HOST]
+            options = {
+                key: value for key, value in user_input.items() if key != CONF_HOST
+            }
+            if options[CONF_BACKOFF_MAX] < options[CONF_BACKOFF_INITIAL]:
+                errors["base"] = "backoff_max_too_small"
+                # Show the form again with what was entered
+                defaults = user_input
+            else:
+                if host != entry.data[CONF_HOST]:
+                    # Update data and options at once, so the entry reloads once
+                    self.hass.config_entries.async_update_entry(
+                        entry, data={**entry.data, CONF_HOST: host}, options=options
+                    )
+                return self.async_create_entry(title="", data=options)
+
+        fields: dict[Any, Any] = OrderedDict()
+        fields[vol.Required(CONF_HOST, default=defaults[CONF_HOST])] = str
+        for option, (_, minimum, maximum) in OPTIONS.items():
+            fields[vol.Required(option, default=defaults[option])] = vol.All(
+                vol.Coerce(float), vol.Range(min=minimum, max=maximum)
+            )
+        fields[vol.Required(CONF_TRACE, default=defaults[CONF_TRACE])] = bool
+        fields[
+            vol.Required(CONF_MODULES, default=defaults[CONF_MODULES])
+        ] = cv.multi_select(MODULES)
+
+        return self.async_show_form(
+            step_id="init",
             data_schema=vol.Schema(fields),
             errors=errors,
         )
@@ -8,3 +8,95 @@ NAME: Final = "Sanitana Eden"
 DOMAIN: Final = "sanitana_eden"
 MANUFACTURER: Final = "Sanitana"
 MODEL: Final = "Eden"
+
+DATA_HUB: Final = f"{DOMAIN}_hub"
+DATA_PROBES: Final = f"{DOMAIN}_probes"
+DATA_WEBSOCKET: Final = f"{DOMAIN}_websocket"
+
+SUBSYSTEMS: Final = ("light", "radio", "bluetooth", "steam")
+# Each subsystem is an optional module of the device
+MODULES: Final = {
+    "light": "Light",
+    "radio": "Radio",
+    "bluetooth": "Bluetooth",
+    "steam": "Steam",
+}
+
+CONF_BACKOFF_INITIAL: Final = "backoff_initial"
+CONF_BACKOFF_MAX: Final = "backoff_max"
+CONF_COMMAND_DEBOUNCE: Final = "command_debounce"
+CONF_COUNTDOWN_INTERVAL: Final = "countdown_interval"
+CONF_MODULES: Final = "modules"
+CONF_PUSH_WINDOW: Final = "push_window"
+CONF_TRACE: Final = "trace"
+CONF_UNAVAILABLE_GRACE: Final = "unavailable_grace"
+CONF_WATCHDOG_TIMEOUT: Final = "watchdog_timeout"
+
+DEFAULT_BACKOFF_INITIAL: Final = 2.0
+DEFAULT_BACKOFF_MAX: Final = 300.0
+DEFAULT_COMMAND_DEBOUNCE: Final = 0.3
+DEFAULT_COUNTDOWN_INTERVAL: Final = 10.0
+DEFAULT_PUSH_WINDOW: Final = 0.0
+DEFAULT_UNAVAILABLE_GRACE: Final = 15.0
+DEFAULT_WATCHDOG_TIMEOUT: Final = 60.0
+
+COMMAND_BUFFER_SIZE: Final = 16
+COMMAND_BUFFER_TTL: Final = 60.0
+COMMAND_BURST: Final = 4
+COMMAND_CONFIRM_TIMEOUT: Final = 5.0
+COMMAND_RATE: Final = 20.0
+# Priority classes of commands, lower is sent first
+COMMAND_PRIORITY_STEAM: Final = 0
+COMMAND_PRIORITY_SWITCH: Final = 1
+COMMAND_PRIORITY_ADJUST: Final = 2
+
+COUNTDOWN_RESYNC: Final = 1.0
+
+DIAGNOSTICS_INTERVAL: Final = 60.0
+
+HEATUP_DEFAULT_RATE: Final = 0.5
+HEATUP_DEFAULT_START: Final = 20.0
+HEATUP_LEARNING_RATE: Final = 0.3
+HEATUP_MIN_SPAN: Final = 60.0
+HEATUP_SAMPLE_INTERVAL: Final = 60.0
+HEATUP_SAMPLES: Final = 32
+
+HUB_MAX_RECONNECTS: Final = 4
+HUB_POLL_INTERVAL: Final = 2.0
+
+RADIO_FREQUENCY_MIN: Final = 8750
+RADIO_FREQUENCY_MAX: Final = 10800
+
+LIGHT_COMMAND_WINDOW: Final = 0.05
+LIGHT_TRANSITION_FRAME_RATE: Final = 10.0
+
+PROBE_CACHE_TTL: Final = 3600.0
+
+SESSION_LOG_SIZE: Final = 1000
+# Interval at which the hours of steam usage that are over are imported
+SESSION_STATISTICS_INTERVAL: Final = 600.0
+
+# A scheduled steam start missed by less while not loaded is still made
+SCHEDULED_START_GRACE: Final = 900.0
+
+SCAN_CONCURRENCY: Final = 64
+SCAN_MAX_HOSTS: Final = 1024
+# The devices answer this on their UDP configuration port
+SCAN_MESSAGE: Final = b"HF-A11ASSISTHREAD"
+SCAN_PORT: Final = 48899
+SCAN_TIMEOUT: Final = 1.5
+
+RECORDING_BUFFER: Final = 10000
+RECORDING_FLUSH_INTERVAL: Final = 5.0
+
+# Signals every push of the device of a config entry
+SIGNAL_TELEMETRY: Final = f"{DOMAIN}_telemetry_{{}}"
+# Shortest interval between the events of a telemetry subscription
+TELEMETRY_MIN_INTERVAL: Final = 0.1
+
+STATS_SAMPLES: Final = 128
+
+STORAGE_SAVE_DELAY: Final = 10.0
+STORAGE_VERSION: Final = 1
+
+TRACE_SIZE: Final = 256
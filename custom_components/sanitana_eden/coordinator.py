@@ -1,58 +1,991 @@
 """DataUpdateCoordinator for sanitana_eden."""
 from __future__ import annotations
 
-from datetime import timedelta
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable
+from contextlib import suppress
+from datetime import datetime
+from pathlib import Path
+import random
+from time import monotonic
+from typing import Any
 
 from aio_sanitana_eden import SanitanaEden
+from aio_sanitana_eden.sanitana_eden import SanitanaEdenState
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
+from homeassistant.components.recorder.statistics import async_add_external_statistics
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant, callback
+from homeassistant.const import UnitOfTemperature, UnitOfTime
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+from homeassistant.helpers.event import async_call_later
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import (
     DataUpdateCoordinator,
     UpdateFailed,
 )
+from homeassistant.util import dt as dt_util, slugify
 
-from .const import DOMAIN, LOGGER
+from .commands import (
+    SanitanaEdenCommandCoalescer,
+    SanitanaEdenCommandScheduler,
+    SanitanaEdenLightCommandBuilder,
+)
+from .const import (
+    COMMAND_BUFFER_SIZE,
+    COMMAND_BUFFER_TTL,
+    COMMAND_CONFIRM_TIMEOUT,
+    COMMAND_PRIORITY_ADJUST,
+    COMMAND_PRIORITY_STEAM,
+    COMMAND_PRIORITY_SWITCH,
+    CONF_BACKOFF_INITIAL,
+    CONF_BACKOFF_MAX,
+    CONF_COMMAND_DEBOUNCE,
+    CONF_COUNTDOWN_INTERVAL,
+    CONF_MODULES,
+    CONF_PUSH_WINDOW,
+    CONF_TRACE,
+    CONF_UNAVAILABLE_GRACE,
+    CONF_WATCHDOG_TIMEOUT,
+    DATA_HUB,
+    DIAGNOSTICS_INTERVAL,
+    DEFAULT_BACKOFF_INITIAL,
+    DEFAULT_BACKOFF_MAX,
+    DEFAULT_COMMAND_DEBOUNCE,
+    DEFAULT_COUNTDOWN_INTERVAL,
+    DEFAULT_PUSH_WINDOW,
+    DEFAULT_UNAVAILABLE_GRACE,
+    DEFAULT_WATCHDOG_TIMEOUT,
+    DOMAIN,
+    HUB_MAX_RECONNECTS,
+    HUB_POLL_INTERVAL,
+    LOGGER,
+    MODULES,
+    RADIO_FREQUENCY_MAX,
+    RADIO_FREQUENCY_MIN,
+    SESSION_STATISTICS_INTERVAL,
+    SIGNAL_TELEMETRY,
+    STORAGE_SAVE_DELAY,
+    STORAGE_VERSION,
+)
+from .recording import SanitanaEdenRecording
+from .snapshot import SanitanaEdenSnapshot
+from .stats import SanitanaEdenStats
+from .steam import (
+    SanitanaEdenHeatUpModel,
+    SanitanaEdenSteamCountdown,
+    SanitanaEdenSteamSessionLog,
+)
+from .trace import SanitanaEdenTrace
+
+
+SanitanaEdenCommand = Callable[[SanitanaEden], Awaitable[None]]
+
+
+class _SanitanaEden(SanitanaEden):
+    """SanitanaEden with connection management.
+
+    The library reconnects at a fixed interval. This reconnects with
+    exponential backoff and jitter instead, so many units coming back after a
+    power failure don't all retry together.
+
+    It also records when the last message arrived. The library only notifies
+    its listeners when the device state changes, so an idle device is silent
+    towards the coordinator even though it answers every poll. Hooking the
+    reader gives the watchdog a cheap liveness signal. When the connection
+    opened is recorded too, for a device that never sends a valid status.
+
+    The same hooks feed the protocol trace, when enabled.
+    """
+
+    connects: int = 0
+    connected_at: float = 0.0
+    last_message: float = 0.0
+    backoff_initial: float = DEFAULT_BACKOFF_INITIAL
+    backoff_max: float = DEFAULT_BACKOFF_MAX
+    trace: SanitanaEdenTrace | None = None
+    _failures: int = 0
+
+    @property
+    def connected(self) -> bool:
+        """Return True if the connection to the device is open."""
+        return self._writer is not None
+
+    def _backoff_delay(self) -> float:
+        """Return the delay before the next connection attempt."""
+        delay = min(
+            self.backoff_max, self.backoff_initial * 2 ** min(self._failures, 16)
+        )
+        self._failures += 1
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                LOGGER.debug("Connecting to %s:%d", self._host, self._port)
+                self._reader, self._writer = await asyncio.open_connection(
+                    self._host, self._port
+                )
+                self.connects += 1
+                self.connected_at = monotonic()
+                async with asyncio.TaskGroup() as tg:
+                    tg.create_task(self._run_reader())
+                    if self._poll_interval > 0:
+                        tg.create_task(self._run_poller())
+            except Exception as exception:
+                LOGGER.debug(
+                    "Connection to %s:%d failed: %s", self._host, self._port, exception
+                )
+            finally:
+                if self._writer is not None:
+                    self._writer.close()
+                    with suppress(Exception):
+                        await self._writer.wait_closed()
+                self._writer = None
+                self._reader = None
+                self._setattr_if_changed("_available", False)
+                self._update_listeners()
+            delay = self._backoff_delay()
+            LOGGER.debug("Reconnecting in %.1f seconds", delay)
+            await asyncio.sleep(delay)
+
+    async def _readline(self) -> bytes:
+        data = await super()._readline()
+        if not data:
+            raise ConnectionError("Connection closed by device")
+        self.last_message = monotonic()
+        self._failures = 0
+        if self.trace is not None:
+            self.trace.add(False, data)
+        return data
+
+    async def async_write_many(
+        self, messages: list[tuple[bytes, tuple[int, ...]]]
+    ) -> None:
+        """Write several commands at once, without waiting in between."""
+        assert self._writer is not None
+        self._writer.write(b"".join(self._encode(cmd, *args) for cmd, args in messages))
+        await self._writer.drain()
+
+    def _encode(self, cmd: bytes, *args: int) -> bytes:
+        data = super()._encode(cmd, *args)
+        if self.trace is not None:
+            self.trace.add(True, data)
+        return data
+
+    def dump(self) -> dict[str, Any]:
+        """Return the state of the device to persist."""
+        return {
+            "state": list(self._state),
+            "steam_temperature": self.steam.temperature,
+            "steam_duration": self.steam.duration,
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Restore the persisted state of the device.
+
+        A running steam program won't have survived the restart, so it is
+        restored as off.
+        """
+        self._state = SanitanaEdenState(*data["state"])._replace(
+            steam_temperature=0, steam_remaining=0
+        )
+        self.steam._temperature = int(data["steam_temperature"])
+        self.steam._duration = int(data["steam_duration"])
 
 
 # https://developers.home-assistant.io/docs/integration_fetching_data#coordinated-single-api-poll-for-data-for-all-entities
 class SanitanaEdenDataUpdateCoordinator(DataUpdateCoordinator):
-    """Class to manage fetching data from the API."""
+    """Class to manage fetching data from the API.
+
+    The coordinator data is a snapshot of the state of each subsystem of the
+    device (light, radio, bluetooth, steam and the steam countdown), which the
+    entities read from. Entities register with the subsystem they represent as
+    their coordinator context, so a push from the device only updates the
+    entities whose subsystem actually changed.
+    """
+
+    data: SanitanaEdenSnapshot
 
     def __init__(self, hass: HomeAssistant, config_entry: ConfigEntry) -> None:
         """Initialize."""
-        self.device = SanitanaEden(config_entry.data["host"], config_entry.data["port"])
+        self.host: str = config_entry.data["host"]
+        self.port: int = config_entry.data["port"]
+        # The hub polls the device, see SanitanaEdenHub
+        self.device = _SanitanaEden(self.host, self.port, poll_interval=0)
         self.config_entry = config_entry
+        self.stats = SanitanaEdenStats()
+        self._last_available = False
+        self._unsub_hub: CALLBACK_TYPE | None = None
+        self._unsub_grace: CALLBACK_TYPE | None = None
+        self._flush: asyncio.Handle | None = None
+        self._command_buffer: OrderedDict[
+            str, tuple[float, int, SanitanaEdenCommand]
+        ] = OrderedDict()
+        self.scheduler = SanitanaEdenCommandScheduler(self)
+        self._confirmations: list[
+            tuple[Callable[[SanitanaEdenSnapshot], bool], asyncio.Future[None]]
+        ] = []
+        self._coalescers: dict[str, SanitanaEdenCommandCoalescer] = {}
+        self.light_commands = SanitanaEdenLightCommandBuilder(self)
+        self.steam_countdown = SanitanaEdenSteamCountdown(self)
+        self.heat_up = SanitanaEdenHeatUpModel()
+        self.steam_sessions = SanitanaEdenSteamSessionLog()
+        # Set by the climate entity, kept across reloads and restarts
+        self.scheduled_start: datetime | None = None
+        # The entities are set up for these, a change reloads the entry
+        self.modules = entry_modules(config_entry)
+        self.recording: SanitanaEdenRecording | None = None
+        self._store = async_get_store(hass, config_entry.entry_id)
+        self._save_due = 0.0
+        # The device pushes its state, there is nothing to poll
         super().__init__(
             hass=hass,
             logger=LOGGER,
             name=DOMAIN,
-            update_interval=timedelta(minutes=5),
         )
 
+    @property
+    def command_debounce(self) -> float:
+        """Return the window in which commands for one setting are coalesced."""
+        return self.config_entry.options.get(
+            CONF_COMMAND_DEBOUNCE, DEFAULT_COMMAND_DEBOUNCE
+        )
+
+    @property
+    def countdown_interval(self) -> float:
+        """Return the interval at which the steam countdown is published."""
+        return self.config_entry.options.get(
+            CONF_COUNTDOWN_INTERVAL, DEFAULT_COUNTDOWN_INTERVAL
+        )
+
+    @property
+    def push_window(self) -> float:
+        """Return the window in which pushes are coalesced into one update."""
+        return self.config_entry.options.get(CONF_PUSH_WINDOW, DEFAULT_PUSH_WINDOW)
+
+    @property
+    def unavailable_grace(self) -> float:
+        """Return the time a disconnected device still shows as available."""
+        return self.config_entry.options.get(
+            CONF_UNAVAILABLE_GRACE, DEFAULT_UNAVAILABLE_GRACE
+        )
+
+    @property
+    def watchdog_timeout(self) -> float:
+        """Return the time without messages after which to reconnect."""
+        return self.config_entry.options.get(
+            CONF_WATCHDOG_TIMEOUT, DEFAULT_WATCHDOG_TIMEOUT
+        )
+
+    @callback
+    def async_update_options(self) -> None:
+        """Apply the options of the config entry to the running device.
+
+        Most options are read from the config entry when used and take effect
+        right away, only those copied elsewhere need applying.
+        """
+        self.device.backoff_initial = self.config_entry.options.get(
+            CONF_BACKOFF_INITIAL, DEFAULT_BACKOFF_INITIAL
+        )
+        self.device.backoff_max = self.config_entry.options.get(
+            CONF_BACKOFF_MAX, DEFAULT_BACKOFF_MAX
+        )
+        if not self.config_entry.options.get(CONF_TRACE, False):
+            self.device.trace = None
+        elif self.device.trace is None:
+            self.device.trace = SanitanaEdenTrace()
+
     async def async_setup(self) -> None:
-        """Set up async tasks."""
+        """Set up async tasks.
+
+        This doesn't wait for the device. The last known state is restored
+        and the startup counts as a grace period, so the entities come up
+        with it while the device connects in the background.
+        """
+        self.async_update_options()
+        if (data := await self._store.async_load()) is not None:
+            try:
+                self.device.restore(data)
+                self.heat_up.restore(data.get("heat_up", {}))
+                self.steam_sessions.restore(data.get("steam_sessions", {}))
+                if (scheduled_start := data.get("scheduled_start")) is not None:
+                    self.scheduled_start = dt_util.parse_datetime(scheduled_start)
+            except (KeyError, TypeError, ValueError) as exception:
+                LOGGER.warning(
+                    "Ignoring stored state of %s: %s",
+                    self.config_entry.title,
+                    exception,
+                )
+            else:
+                self._last_available = True
+                self._unsub_grace = async_call_later(
+                    self.hass, self.unavailable_grace, self._async_grace_expired
+                )
         self._remove_listener = self.device.add_listener(self.sanitana_update)
         await self.device.async_setup()
+        self._unsub_hub = async_get_hub(self.hass).async_register(self)
 
     async def async_shutdown(self) -> None:
         """Shut down async tasks."""
+        if self._unsub_hub is not None:
+            self._unsub_hub()
+            self._unsub_hub = None
+        if self._unsub_grace is not None:
+            self._unsub_grace()
+            self._unsub_grace = None
+        if self._flush is not None:
+            self._flush.cancel()
+            self._flush = None
+        self.scheduler.async_cancel()
+        self._command_buffer.clear()
+        self.steam_sessions.pause(dt_util.utcnow().timestamp())
+        if self.device.connects:
+            await self._store.async_save(self._dump())
+        for coalescer in self._coalescers.values():
+            coalescer.async_cancel()
+        self.light_commands.async_cancel()
+        self.steam_countdown.async_stop()
+        await self.async_stop_recording()
         self._remove_listener()
         await self.device.async_shutdown()
 
-    async def _async_update_data(self):
+    async def async_start_recording(
+        self, path: Path, max_bytes: int, backup_count: int
+    ) -> None:
+        """Start recording the updates of the device to a file."""
+        await self.async_stop_recording()
+        LOGGER.info("Recording updates of %s to %s", self.config_entry.title, path)
+        self.recording = SanitanaEdenRecording(self.hass, path, max_bytes, backup_count)
+        self.recording.add(self.device)
+
+    async def async_stop_recording(self) -> None:
+        """Stop recording the updates of the device."""
+        if (recording := self.recording) is not None:
+            self.recording = None
+            await recording.async_stop()
+
+    @callback
+    def async_watchdog_expired(self) -> bool:
+        """Return True if a connected device has gone silent.
+
+        The library reconnects by itself when the connection drops, but a
+        half-open connection goes unnoticed, as does a connection on which the
+        device never sends a valid status.
+        """
+        device = self.device
+        if device.available:
+            silence = monotonic() - device.last_message
+        elif device.connected:
+            silence = monotonic() - device.connected_at
+        else:
+            return False
+        if silence < self.watchdog_timeout:
+            return False
+        LOGGER.warning(
+            "No %smessage from %s for %.0f seconds, reconnecting",
+            "" if device.available else "valid ",
+            self.config_entry.title,
+            silence,
+        )
+        return True
+
+    async def async_reconnect(self) -> None:
+        """Restart the connection, marking the device unavailable until it talks."""
+        await self.device.async_shutdown()
+        await self.device.async_setup()
+
+    async def _async_update_data(self) -> SanitanaEdenSnapshot:
         """Update data via library."""
         try:
-            # await self.device.async_update()
-            pass
+            return SanitanaEdenSnapshot.from_device(
+                self.device, self.steam_countdown.is_on
+            )
         except Exception as exception:
             raise UpdateFailed(exception) from exception
 
     @property
     def available(self) -> bool:
-        """Return True if entity is available."""
-        return self.device.available
+        """Return True if entity is available.
+
+        A device that disconnected less than the grace period ago still counts
+        as available, so short outages don't flip every entity.
+        """
+        return self.device.available or self._unsub_grace is not None
+
+    async def async_send_command(
+        self,
+        subsystem: str,
+        key: str,
+        command: SanitanaEdenCommand,
+        priority: int = COMMAND_PRIORITY_ADJUST,
+        confirm: Callable[[SanitanaEdenSnapshot], bool] | None = None,
+    ) -> None:
+        """Send a command for a subsystem to the device.
+
+        Commands are sent through the scheduler in order of priority, see
+        SanitanaEdenCommandScheduler. With a confirm predicate, this returns
+        once a state pushed by the device satisfies it, and raises
+        HomeAssistantError if none does in time. A command superseded by a
+        later one under the same key returns right away. While the device is
+        disconnected, the command is buffered under its key instead and
+        replayed once the device reports back. Only the latest command per key
+        is kept, for a limited time.
+        """
+        if self.device.connected:
+            start = monotonic()
+            try:
+                sent = await self.scheduler.async_send(priority, key, command)
+            except ConnectionError:
+                pass
+            else:
+                if not sent:
+                    return
+                commands = self.stats.commands
+                commands[subsystem] = commands.get(subsystem, 0) + 1
+                self.stats.command_latency.add(monotonic() - start)
+                if confirm is None:
+                    # Settings like the steam duration only change locally
+                    self.async_publish_snapshot()
+                    self.async_save_state()
+                    return
+                await self._async_wait_confirmed(key, confirm)
+                return
+        self._command_buffer.pop(key, None)
+        self._command_buffer[key] = (
+            monotonic() + COMMAND_BUFFER_TTL,
+            priority,
+            command,
+        )
+        while len(self._command_buffer) > COMMAND_BUFFER_SIZE:
+            self._command_buffer.popitem(last=False)
+        LOGGER.debug("Buffered %s command for %s", key, self.config_entry.title)
+
+    async def _async_wait_confirmed(
+        self, key: str, confirm: Callable[[SanitanaEdenSnapshot], bool]
+    ) -> None:
+        """Wait until the device echoed the state a command asked for."""
+        start = monotonic()
+        confirmation = (confirm, self.hass.loop.create_future())
+        self._confirmations.append(confirmation)
+        try:
+            # Settings like the steam duration only change locally
+            self.async_publish_snapshot()
+            self.async_save_state()
+            async with asyncio.timeout(COMMAND_CONFIRM_TIMEOUT):
+                await confirmation[1]
+        except TimeoutError as exception:
+            self.stats.unconfirmed_commands += 1
+            raise HomeAssistantError(
+                f"{self.config_entry.title} did not confirm the {key} command"
+            ) from exception
+        finally:
+            with suppress(ValueError):
+                self._confirmations.remove(confirmation)
+        self.stats.confirm_latency.add(monotonic() - start)
+
+    async def async_set_steam_temperature(self, temperature: float) -> None:
+        """Set the steam temperature.
+
+        A running program only takes a new setpoint when it is sent again,
+        which restarts it. It is sent with the minutes the program has left,
+        so changing the setpoint doesn't make the session any longer.
+        """
+        steam = self.device.steam
+        setpoint = steam.temperature
+        await steam.async_set_temperature(temperature)
+        if steam.is_on and steam.temperature != setpoint:
+            message = self._steam_setpoint_message()
+            await self.async_send_command(
+                "steam",
+                "steam",
+                lambda device: device.async_write_many([message]),
+                COMMAND_PRIORITY_STEAM,
+            )
+        self.async_save_state()
+        self.async_publish_snapshot()
+
+    def _steam_setpoint_message(self) -> tuple[bytes, tuple[int, ...]]:
+        """Return the command sending the setpoint to the running program."""
+        minutes = max(round(self.steam_countdown.remaining / 60.0), 1)
+        self.steam_countdown.async_restart(minutes)
+        return (b"n", (int(self.device.steam.temperature), minutes))
+
+    async def async_apply_state(self, **state: Any) -> None:
+        """Bring the device to a desired state with as few writes as possible.
+
+        Only the commands needed to reach the state from the current state are
+        sent, pipelined in a single write. Keys that are left out keep their
+        current state. A new steam temperature is sent to a running program
+        right away, see async_set_steam_temperature. The radio settings are
+        combined into one command, as separate radio commands would each
+        resend the other settings.
+        """
+        device = self.device
+        current = device._state
+        messages: list[tuple[bytes, tuple[int, ...]]] = []
+
+        setpoint = device.steam.temperature
+        if (temperature := state.get("steam_temperature")) is not None:
+            await device.steam.async_set_temperature(temperature)
+        if (duration := state.get("steam_duration")) is not None:
+            await device.steam.async_set_duration(duration)
+        if (steam := state.get("steam")) is not None and steam != device.steam.is_on:
+            messages.append(
+                (
+                    b"n",
+                    (int(device.steam.temperature), int(device.steam.duration))
+                    if steam
+                    else (0, 0),
+                )
+            )
+        elif device.steam.is_on and device.steam.temperature != setpoint:
+            messages.append(self._steam_setpoint_message())
+
+        if (bluetooth := state.get("bluetooth")) is not None:
+            if int(bluetooth) != current.bluetooth_on:
+                messages.append((b"r", (int(bluetooth),)))
+
+        radio = (
+            int(state.get("radio", current.radio_on)),
+            round(state["radio_frequency"] * 100.0)
+            if "radio_frequency" in state
+            else current.radio_frequency,
+            int(state.get("radio_volume", current.radio_volume)),
+        )
+        if radio != (current.radio_on, current.radio_frequency, current.radio_volume):
+            messages.append((b"j", radio))
+
+        light = state.get("light")
+        if "light_rgb_color" in state or "light_brightness" in state:
+            light = light is not False
+        if light is not None:
+            rgb: tuple[int, int, int] = (0, 0, 0)
+            if light:
+                brightness = (
+                    state.get("light_brightness") or device.light.brightness or 255
+                )
+                rgb = tuple(  # type: ignore[assignment]
+                    int(value * brightness / 255)
+                    for value in state.get("light_rgb_color") or device.light.rgb_color
+                )
+            if rgb != (current.light_red, current.light_green, current.light_blue):
+                messages.append((b"m", rgb))
+
+        if not messages:
+            # At most the steam settings changed, which only live locally
+            self.async_publish_snapshot()
+            self.async_save_state()
+            return
+        LOGGER.debug("Applying %s to %s", messages, self.config_entry.title)
+        # Only a later call sending the same commands supersedes this one
+        await self.async_send_command(
+            "apply",
+            "apply_state_" + b"".join(cmd for cmd, _ in messages).decode(),
+            lambda device: device.async_write_many(messages),
+            COMMAND_PRIORITY_STEAM
+            if messages[0][0] == b"n"
+            else COMMAND_PRIORITY_SWITCH,
+        )
+
+    async def _async_replay_commands(self) -> None:
+        """Replay the commands buffered while the device was disconnected."""
+        now = monotonic()
+        while self._command_buffer and self.device.connected:
+            key, (expires, priority, command) = self._command_buffer.popitem(last=False)
+            if expires < now:
+                continue
+            LOGGER.debug("Replaying %s command for %s", key, self.config_entry.title)
+            try:
+                await self.scheduler.async_send(priority, key, command)
+            except Exception as exception:
+                LOGGER.error("Failed to replay %s command: %s", key, exception)
+
+    @callback
+    def _async_grace_expired(self, _now: datetime) -> None:
+        """Mark the entities unavailable once the grace period is over."""
+        self._unsub_grace = None
+        self._last_available = self.available
+        self.async_update_listeners()
+        self._async_update_telemetry_listeners()
+
+    @callback
+    def async_save_state(self) -> None:
+        """Persist the state of the device, batching frequent changes.
+
+        The state is written at most the save delay after the first change,
+        the pushes of a steam session don't keep postponing it.
+        """
+        now = monotonic()
+        if self._save_due <= now:
+            self._save_due = now + STORAGE_SAVE_DELAY
+        self._store.async_delay_save(self._dump, self._save_due - now)
+
+    def _dump(self) -> dict[str, Any]:
+        return {
+            **self.device.dump(),
+            "heat_up": self.heat_up.dump(),
+            "steam_sessions": self.steam_sessions.dump(),
+            "scheduled_start": None
+            if self.scheduled_start is None
+            else self.scheduled_start.isoformat(),
+        }
+
+    @callback
+    def async_add_coalescer(
+        self,
+        key: str,
+        subsystem: str,
+        set_fn: Callable[[SanitanaEdenDataUpdateCoordinator, float], Awaitable[None]],
+        value_fn: Callable[[SanitanaEdenSnapshot], float],
+    ) -> SanitanaEdenCommandCoalescer:
+        """Return the command coalescer for a device setting."""
+        if (coalescer := self._coalescers.get(key)) is None:
+            coalescer = SanitanaEdenCommandCoalescer(
+                self, key, subsystem, set_fn, value_fn
+            )
+            self._coalescers[key] = coalescer
+        return coalescer
+
+    async def async_set_radio(
+        self, *, frequency: float | None = None, volume: float | None = None
+    ) -> None:
+        """Set the radio frequency or volume.
+
+        The device takes the radio settings in a single command. A setting
+        left out is sent as the value still being set for it, if any, so
+        setting both in a row doesn't undo the first.
+        """
+        current = self.device._state
+        if frequency is None and "radio_frequency" in self._coalescers:
+            frequency = self._coalescers["radio_frequency"].value
+        if volume is None and "radio_volume" in self._coalescers:
+            volume = self._coalescers["radio_volume"].value
+        radio = (
+            current.radio_on,
+            current.radio_frequency if frequency is None else round(frequency * 100.0),
+            current.radio_volume if volume is None else round(volume),
+        )
+        await self.device.async_write_many([(b"j", radio)])
+
+    @callback
+    def async_import_statistics(self) -> None:
+        """Import the hours of steam usage that are over into the statistics.
+
+        Each hour gets one row per statistic: the sessions started and the
+        minutes of steam as sums, and the average setpoint as a mean.
+        """
+        if not (hours := self.steam_sessions.pop_hours(dt_util.utcnow().timestamp())):
+            return
+        unique_id = self.config_entry.unique_id
+        title = self.config_entry.title
+
+        def metadata(key: str, name: str, unit: str | None) -> StatisticMetaData:
+            return StatisticMetaData(
+                has_mean=key == "setpoint",
+                has_sum=key != "setpoint",
+                name=f"{title} {name}",
+                source=DOMAIN,
+                statistic_id=f"{DOMAIN}:{slugify(f'{unique_id}_steam_{key}')}",
+                unit_of_measurement=unit,
+            )
+
+        starts = {hour.start: dt_util.utc_from_timestamp(hour.start) for hour in hours}
+        async_add_external_statistics(
+            self.hass,
+            metadata("sessions", "steam sessions", None),
+            [
+                StatisticData(
+                    start=starts[hour.start],
+                    state=hour.sessions,
+                    sum=hour.total_sessions,
+                )
+                for hour in hours
+            ],
+        )
+        async_add_external_statistics(
+            self.hass,
+            metadata("minutes", "steam minutes", UnitOfTime.MINUTES),
+            [
+                StatisticData(
+                    start=starts[hour.start],
+                    state=hour.minutes,
+                    sum=hour.total_minutes,
+                )
+                for hour in hours
+            ],
+        )
+        if setpoints := [
+            StatisticData(
+                start=starts[hour.start],
+                mean=hour.setpoint,
+                min=hour.setpoint,
+                max=hour.setpoint,
+            )
+            for hour in hours
+            if hour.setpoint is not None
+        ]:
+            async_add_external_statistics(
+                self.hass,
+                metadata("setpoint", "steam setpoint", UnitOfTemperature.CELSIUS),
+                setpoints,
+            )
+        self.async_save_state()
+
+    @callback
+    def _async_update_telemetry_listeners(self) -> None:
+        """Signal every push from the device, bypassing the entities.
+
+        The listeners follow the config entry rather than this coordinator,
+        so they carry on with the next coordinator after a reload.
+        """
+        async_dispatcher_send(
+            self.hass, SIGNAL_TELEMETRY.format(self.config_entry.entry_id)
+        )
+
+    def has_module(self, subsystem: str) -> bool:
+        """Return True if the device has the module of a subsystem."""
+        if subsystem == "countdown":
+            subsystem = "steam"
+        return subsystem not in MODULES or subsystem in self.modules
+
+    @property
+    def last_message_age(self) -> float | None:
+        """Return the seconds since the last message from the device."""
+        if not self.device.last_message:
+            return None
+        return monotonic() - self.device.last_message
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all registered listeners."""
+        self.stats.state_writes += len(self._listeners)
+        super().async_update_listeners()
+
+    @callback
+    def async_update_listeners_for(self, subsystems: set[str]) -> None:
+        """Update the listeners of the given subsystems only."""
+        stats = self.stats
+        for update_callback, context in list(self._listeners.values()):
+            if context is None or context in subsystems:
+                stats.state_writes += 1
+                update_callback()
+            else:
+                stats.skipped_writes += 1
 
     @callback
     def sanitana_update(self):
-        """Process update from the device."""
-        self.async_set_updated_data(None)
+        """Process update from the device.
+
+        The models following the device see every push, but the entities are
+        updated once for all pushes arriving in the same iteration of the event
+        loop, or within the push window if one is configured.
+        """
+        self.stats.pushes += 1
+        if self.recording is not None:
+            self.recording.add(self.device)
+        steam = self.device.steam
+        self.steam_countdown.async_sync()
+        self.heat_up.update(
+            steam.is_on, steam.current_temperature, steam.temperature, monotonic()
+        )
+
+        if self.device.available:
+            if self._unsub_grace is not None:
+                self._unsub_grace()
+                self._unsub_grace = None
+            self.steam_sessions.update(
+                steam.is_on,
+                steam.temperature,
+                steam.duration,
+                dt_util.utcnow().timestamp(),
+            )
+            if CONF_MODULES not in self.config_entry.data:
+                self.hass.config_entries.async_update_entry(
+                    self.config_entry,
+                    data={
+                        **self.config_entry.data,
+                        CONF_MODULES: detect_modules(self.device._state),
+                    },
+                )
+            self.async_save_state()
+            if self._command_buffer:
+                self.hass.async_create_background_task(
+                    self._async_replay_commands(), f"{DOMAIN} replay commands"
+                )
+        else:
+            self.steam_sessions.pause(dt_util.utcnow().timestamp())
+            if self._last_available and self._unsub_grace is None:
+                self._unsub_grace = async_call_later(
+                    self.hass, self.unavailable_grace, self._async_grace_expired
+                )
+        self._async_update_telemetry_listeners()
+        if self._flush is None:
+            if window := self.push_window:
+                self._flush = self.hass.loop.call_later(window, self._async_flush)
+            else:
+                self._flush = self.hass.loop.call_soon(self._async_flush)
+
+    @callback
+    def _async_flush(self) -> None:
+        """Publish the pushes received since the last flush."""
+        self._flush = None
+        self.stats.dispatches += 1
+        self.async_publish_snapshot()
+
+    @callback
+    def async_publish_snapshot(self) -> None:
+        """Take a snapshot of the device and update the entities that changed."""
+        previous = self.data
+        self.data = snapshot = SanitanaEdenSnapshot.from_device(
+            self.device, self.steam_countdown.is_on, previous
+        )
+        self.last_update_success = True
+
+        for confirm, future in self._confirmations:
+            if not future.done() and confirm(snapshot):
+                future.set_result(None)
+
+        # A change in availability affects every entity
+        available = self.available
+        if previous is None or available != self._last_available:
+            self._last_available = available
+            self.async_update_listeners()
+            return
+
+        if changed := snapshot.changed(previous):
+            self.async_update_listeners_for(changed)
+
+
+def detect_modules(state: SanitanaEdenState) -> list[str]:
+    """Return the modules a device has, judging by the state it reports.
+
+    Only a missing radio shows, as an invalid frequency. The other modules
+    are assumed present, they can be left out in the options.
+    """
+    return [
+        module
+        for module in MODULES
+        if module != "radio"
+        or RADIO_FREQUENCY_MIN <= state.radio_frequency <= RADIO_FREQUENCY_MAX
+    ]
+
+
+def entry_modules(entry: ConfigEntry) -> frozenset[str]:
+    """Return the modules of the device of an entry.
+
+    The modules chosen in the options take precedence over those detected.
+    Until the device reported its state, all modules are assumed.
+    """
+    if (modules := entry.options.get(CONF_MODULES)) is None:
+        modules = entry.data.get(CONF_MODULES, MODULES)
+    return frozenset(modules)
+
+
+@callback
+def async_get_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, Any]]:
+    """Return the store with the last known state of a device."""
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}")
+
+
+@callback
+def async_get_hub(hass: HomeAssistant) -> SanitanaEdenHub:
+    """Return the hub shared by all Sanitana Eden devices."""
+    if (hub := hass.data.get(DATA_HUB)) is None:
+        hub = hass.data[DATA_HUB] = SanitanaEdenHub(hass)
+    return hub
+
+
+class SanitanaEdenHub:
+    """Supervise all Sanitana Eden devices from a single task.
+
+    Rather than every device running its own poller and every coordinator its
+    own watchdog timer, one supervisor task polls all connected devices, checks
+    their watchdogs and reconnects silent devices a few at a time, so a site
+    with many cabins costs one task and one timer. The same task periodically
+    imports the steam usage of all devices into the long-term statistics.
+    """
+
+    def __init__(self, hass: HomeAssistant) -> None:
+        """Initialize."""
+        self.hass = hass
+        self._coordinators: dict[str, SanitanaEdenDataUpdateCoordinator] = {}
+        # Ordered set of the coordinators waiting for a reconnect
+        self._reconnects: dict[str, SanitanaEdenDataUpdateCoordinator] = {}
+        self._task: asyncio.Task[None] | None = None
+
+    @callback
+    def async_register(
+        self, coordinator: SanitanaEdenDataUpdateCoordinator
+    ) -> CALLBACK_TYPE:
+        """Register a coordinator, return a callback to unregister it."""
+        entry_id = coordinator.config_entry.entry_id
+
+        @callback
+        def unregister() -> None:
+            self._coordinators.pop(entry_id, None)
+            self._reconnects.pop(entry_id, None)
+            if not self._coordinators and self._task is not None:
+                self._task.cancel()
+                self._task = None
+
+        self._coordinators[entry_id] = coordinator
+        if self._task is None:
+            self._task = self.hass.async_create_background_task(
+                self._async_run(), f"{DOMAIN} hub"
+            )
+        return unregister
+
+    async def _async_run(self) -> None:
+        next_diagnostics = monotonic() + DIAGNOSTICS_INTERVAL
+        next_statistics = monotonic()
+        while True:
+            if diagnostics := monotonic() >= next_diagnostics:
+                next_diagnostics += DIAGNOSTICS_INTERVAL
+            if statistics := monotonic() >= next_statistics:
+                next_statistics += SESSION_STATISTICS_INTERVAL
+
+            for entry_id, coordinator in list(self._coordinators.items()):
+                # A failing device must not stop the supervision of the others
+                try:
+                    await self._async_supervise(
+                        entry_id, coordinator, diagnostics, statistics
+                    )
+                except Exception:
+                    LOGGER.exception(
+                        "Failed to supervise %s", coordinator.config_entry.title
+                    )
+
+            for _ in range(min(len(self._reconnects), HUB_MAX_RECONNECTS)):
+                entry_id = next(iter(self._reconnects))
+                coordinator = self._reconnects.pop(entry_id)
+                try:
+                    await coordinator.async_reconnect()
+                except Exception:
+                    LOGGER.exception(
+                        "Failed to reconnect %s", coordinator.config_entry.title
+                    )
+
+            await asyncio.sleep(HUB_POLL_INTERVAL)
+
+    async def _async_supervise(
+        self,
+        entry_id: str,
+        coordinator: SanitanaEdenDataUpdateCoordinator,
+        diagnostics: bool,
+        statistics: bool,
+    ) -> None:
+        if diagnostics:
+            coordinator.async_update_listeners_for({"diagnostics"})
+        if statistics:
+            coordinator.async_import_statistics()
+        device = coordinator.device
+        if coordinator.async_watchdog_expired():
+            self._reconnects[entry_id] = coordinator
+        elif device.connected:
+            try:
+                await device.async_update()
+            except Exception as exception:
+                LOGGER.debug("Failed to poll %s: %s", entry_id, exception)
@@ -0,0 +1,61 @@
+"""Diagnostics support for sanitana_eden."""
+from __future__ import annotations
+
+from dataclasses import asdict
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import SanitanaEdenDataUpdateCoordinator
+
+TO_REDACT = {"mac_ap", "mac_sta", "mac_used"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator: SanitanaEdenDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    device = coordinator.device
+    stats = coordinator.stats
+    return {
+        "entry": {
+            "title": entry.title,
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": dict(entry.options),
+        },
+        "connection": {
+            "connected": device.connected,
+            "available": device.available,
+            "connects": device.connects,
+            "last_message_age": coordinator.last_message_age,
+            "modules": sorted(coordinator.modules),
+            "buffered_commands": list(coordinator._command_buffer),
+            "queued_commands": coordinator.scheduler.queued,
+            "superseded_commands": coordinator.scheduler.superseded,
+        },
+        "stats": {
+            "pushes": stats.pushes,
+            "dispatches": stats.dispatches,
+            "pushes_per_dispatch": stats.pushes_per_dispatch,
+            "state_writes": stats.state_writes,
+            "skipped_writes": stats.skipped_writes,
+            "limited_writes": stats.limited_writes,
+            "commands": dict(stats.commands),
+            "command_latency_p50": stats.command_latency.percentile(50.0),
+            "command_latency_p95": stats.command_latency.percentile(95.0),
+            "confirm_latency_p50": stats.confirm_latency.percentile(50.0),
+            "confirm_latency_p95": stats.confirm_latency.percentile(95.0),
+            "unconfirmed_commands": stats.unconfirmed_commands,
+        },
+        "state": {
+            "device": device._state._asdict(),
+            "subsystems": asdict(coordinator.data),
+            "heat_up": coordinator.heat_up.dump(),
+            "steam_sessions": coordinator.steam_sessions.dump(),
+        },
+        "trace": None if device.trace is None else device.trace.as_list(),
+    }
@@ -1,22 +1,72 @@
 """SanitanaEdenEntity class."""
 from __future__ import annotations
 
-from homeassistant.helpers.entity import DeviceInfo
+import asyncio
+from collections.abc import Hashable, Iterable
+from dataclasses import dataclass
+from time import monotonic
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import DeviceInfo, EntityDescription
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.helpers.device_registry import (
     CONNECTION_NETWORK_MAC,
     format_mac,
 )
 from .coordinator import SanitanaEdenDataUpdateCoordinator
-from .const import MANUFACTURER, MODEL
+from .const import DOMAIN, MANUFACTURER, MODEL
+
+
+@dataclass(frozen=True, slots=True)
+class SanitanaEdenWritePolicy:
+    """Limit the state writes of an entity with a continuous value.
+
+    A value is written at most once per minimum interval, and a change smaller
+    than the deadband is held back for the trailing delay. A value held back
+    is written once its wait is over, so the last value always lands.
+    """
+
+    min_interval: float = 0.0
+    deadband: float = 0.0
+    trailing: float = 60.0
+
+
+@callback
+def async_remove_absent_entities(
+    hass: HomeAssistant,
+    coordinator: SanitanaEdenDataUpdateCoordinator,
+    domain: str,
+    entity_descriptions: Iterable[EntityDescription],
+) -> None:
+    """Remove the entities of modules the device doesn't have."""
+    registry = er.async_get(hass)
+    for entity_description in entity_descriptions:
+        subsystem = entity_description.subsystem  # type: ignore[attr-defined]
+        if coordinator.has_module(subsystem):
+            continue
+        unique_id = coordinator.config_entry.unique_id
+        if entity_description.name is not None:
+            unique_id = f"{unique_id}_{entity_description.key}"
+        if entity_id := registry.async_get_entity_id(domain, DOMAIN, unique_id):
+            registry.async_remove(entity_id)
 
 
 class SanitanaEdenEntity(CoordinatorEntity):
-    """SanitanaEdenEntity class."""
+    """SanitanaEdenEntity class.
+
+    Entities with a write policy are rate limited on their continuous value,
+    see _limited_value. A change of their discrete state, see _discrete_state,
+    is always written right away.
+    """
 
-    def __init__(self, coordinator: SanitanaEdenDataUpdateCoordinator) -> None:
+    _write_policy: SanitanaEdenWritePolicy | None = None
+
+    def __init__(
+        self, coordinator: SanitanaEdenDataUpdateCoordinator, subsystem: str
+    ) -> None:
         """Initialize."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, subsystem)
         self._attr_device_info = DeviceInfo(
             connections={
                 (
@@ -32,8 +82,78 @@ class SanitanaEdenEntity(CoordinatorEntity):
             manufacturer=MANUFACTURER,
             model=MODEL,
         )
+        self._written_state: Hashable = None
+        self._written_value: float | None = None
+        self._written_at = 0.0
+        self._flush: asyncio.TimerHandle | None = None
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
         return self.coordinator.available
+
+    @property
+    def _discrete_state(self) -> Hashable:
+        """Return the part of the state that is never rate limited."""
+        return (
+            self.available,
+            getattr(self.coordinator.data, self.coordinator_context).is_on,
+        )
+
+    @property
+    def _limited_value(self) -> float | None:
+        """Return the continuous value the write policy applies to."""
+        return None
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel a pending trailing write when removed."""
+        self._async_cancel_flush()
+        await super().async_will_remove_from_hass()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write the state, unless the write policy holds it back."""
+        if (policy := self._write_policy) is None:
+            super()._handle_coordinator_update()
+            return
+        state = self._discrete_state
+        value = self._limited_value
+        written = self._written_value
+        if state == self._written_state and value is not None and written is not None:
+            if value == written:
+                self._async_cancel_flush()
+                return
+            now = monotonic()
+            if abs(value - written) < policy.deadband:
+                self._async_hold(now + policy.trailing)
+                return
+            if now - self._written_at < policy.min_interval:
+                self._async_hold(self._written_at + policy.min_interval)
+                return
+        self._async_write_limited()
+
+    @callback
+    def _async_hold(self, due: float) -> None:
+        """Write the state at a later time, unless already due sooner."""
+        self.coordinator.stats.limited_writes += 1
+        if self._flush is not None:
+            if self._flush.when() - self.hass.loop.time() <= due - monotonic():
+                return
+            self._flush.cancel()
+        self._flush = self.hass.loop.call_later(
+            max(due - monotonic(), 0.0), self._async_write_limited
+        )
+
+    @callback
+    def _async_write_limited(self) -> None:
+        self._async_cancel_flush()
+        self._written_state = self._discrete_state
+        self._written_value = self._limited_value
+        self._written_at = monotonic()
+        self.async_write_ha_state()
+
+    @callback
+    def _async_cancel_flush(self) -> None:
+        if self._flush is not None:
+            self._flush.cancel()
+            self._flush = None
@@ -8,6 +8,7 @@ from homeassistant.components.light import (
     ColorMode,
     LightEntity,
     LightEntityDescription,
+    LightEntityFeature,
 )
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
@@ -23,6 +24,7 @@ class SanitanaEdenLightEntityDescription(LightEntityDescription):
     """Describes Sanitana Eden light entity."""
 
     has_entity_name: bool = True
+    subsystem: str = "light"
 
 
 ENTITY_DESCRIPTIONS = (
@@ -43,6 +45,7 @@ async def async_setup_entry(
     async_add_entities(
         SanitanaEdenLightEntity(coordinator, entity_description)
         for entity_description in ENTITY_DESCRIPTIONS
+        if coordinator.has_module(entity_description.subsystem)
     )
 
 
@@ -58,7 +61,7 @@ class SanitanaEdenLightEntity(SanitanaEdenEntity, LightEntity):
         entity_description: SanitanaEdenLightEntityDescription,
     ) -> None:
         """Initialize the light class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_description.subsystem)
         self.entity_description = entity_description  # type: ignore
         self._attr_unique_id: str | None = coordinator.config_entry.unique_id
         if entity_description.name is not None and self._attr_unique_id is not None:
@@ -66,26 +69,27 @@ class SanitanaEdenLightEntity(SanitanaEdenEntity, LightEntity):
 
         self._attr_supported_color_modes = {ColorMode.RGB}
         self._attr_color_mode = ColorMode.RGB
+        self._attr_supported_features = LightEntityFeature.TRANSITION
 
     @property
     def is_on(self) -> bool:
         """Return True if entity is on."""
-        return self.coordinator.device.light.is_on
+        return self.coordinator.data.light.is_on
 
     @property
     def brightness(self) -> int:
         """Return the brightness of this light between 0..255."""
-        return self.coordinator.device.light.brightness
+        return self.coordinator.data.light.brightness
 
     @property
     def rgb_color(self) -> tuple[int, ...]:
         """Return the rgb color value [int, int, int]."""
-        return self.coordinator.device.light.rgb_color
+        return self.coordinator.data.light.rgb_color
 
     async def async_turn_on(self, **kwargs) -> None:
         """Turn on light."""
-        await self.coordinator.device.light.async_turn_on(**kwargs)
+        await self.coordinator.light_commands.async_turn_on(**kwargs)
 
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn off light."""
-        await self.coordinator.device.light.async_turn_off(**kwargs)
+        await self.coordinator.light_commands.async_turn_off(**kwargs)
@@ -1,11 +1,11 @@
 """Switch platform for sanitana_eden."""
 from __future__ import annotations
 
-from collections.abc import Awaitable, Callable
+from collections.abc import Awaitable, Callable, Hashable
 from dataclasses import dataclass
 
-from aio_sanitana_eden import SanitanaEden
 from homeassistant.components.number import (
+    DOMAIN as NUMBER_DOMAIN,
     NumberEntity,
     NumberEntityDescription,
     NumberDeviceClass,
@@ -16,7 +16,12 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .coordinator import SanitanaEdenDataUpdateCoordinator
-from .entity import SanitanaEdenEntity
+from .entity import (
+    SanitanaEdenEntity,
+    SanitanaEdenWritePolicy,
+    async_remove_absent_entities,
+)
+from .snapshot import SanitanaEdenSnapshot
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -24,41 +29,52 @@ class SanitanaEdenNumberEntityDescription(NumberEntityDescription):
     """Describes Sanitana Eden switch entity."""
 
     has_entity_name: bool = True
-    value_fn: Callable[[SanitanaEden], float]
-    set_fn: Callable[[SanitanaEden, float], Awaitable[None]]
+    subsystem: str
+    value_fn: Callable[[SanitanaEdenSnapshot], float]
+    set_fn: Callable[[SanitanaEdenDataUpdateCoordinator, float], Awaitable[None]]
+    write_policy: SanitanaEdenWritePolicy | None = None
 
 
 ENTITY_DESCRIPTIONS = (
     SanitanaEdenNumberEntityDescription(
         key="radio_frequency",
+        subsystem="radio",
         name="Radio Frequency",
         translation_key="radio_frequency",
-        value_fn=lambda device: device.radio.frequency,
-        set_fn=lambda device, frequency: device.radio.async_set_frequency(frequency),
+        value_fn=lambda data: data.radio.frequency,
+        set_fn=lambda coordinator, frequency: coordinator.async_set_radio(
+            frequency=frequency
+        ),
         native_max_value=108.0,
         native_min_value=87.5,
         native_step=0.01,
         native_unit_of_measurement="MHz",
         icon="mdi:radio-fm",
         device_class=NumberDeviceClass.FREQUENCY,
+        write_policy=SanitanaEdenWritePolicy(min_interval=1.0),
     ),
     SanitanaEdenNumberEntityDescription(
         key="radio_volume",
+        subsystem="radio",
         name="Radio Volume",
         translation_key="radio_volume",
-        value_fn=lambda device: device.radio.volume,
-        set_fn=lambda device, volume: device.radio.async_set_volume(volume),
+        value_fn=lambda data: data.radio.volume,
+        set_fn=lambda coordinator, volume: coordinator.async_set_radio(volume=volume),
         native_max_value=63.0,
         native_min_value=0.0,
         native_step=1.0,
         icon="mdi:knob",
+        write_policy=SanitanaEdenWritePolicy(min_interval=1.0),
     ),
     SanitanaEdenNumberEntityDescription(
         key="steam_duration",
+        subsystem="steam",
         name="Steam Duration",
         translation_key="steam_duration",
-        value_fn=lambda device: device.steam.duration,
-        set_fn=lambda device, duration: device.steam.async_set_duration(duration),
+        value_fn=lambda data: data.steam.duration,
+        set_fn=lambda coordinator, duration: (
+            coordinator.device.steam.async_set_duration(duration)
+        ),
         native_max_value=30.0,
         native_min_value=10.0,
         native_step=1.0,
@@ -75,9 +91,11 @@ async def async_setup_entry(
     """Set up switch platform."""
 
     coordinator: SanitanaEdenDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_remove_absent_entities(hass, coordinator, NUMBER_DOMAIN, ENTITY_DESCRIPTIONS)
     async_add_entities(
         SanitanaEdenNumberEntity(coordinator, entity_description)
         for entity_description in ENTITY_DESCRIPTIONS
+        if coordinator.has_module(entity_description.subsystem)
     )
 
 
@@ -93,18 +111,38 @@ class SanitanaEdenNumberEntity(SanitanaEdenEntity, NumberEntity):
         entity_description: SanitanaEdenNumberEntityDescription,
     ) -> None:
         """Initialize the number class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_description.subsystem)
         self.entity_description = entity_description
+        self._write_policy = entity_description.write_policy
         self._attr_unique_id: str | None = coordinator.config_entry.unique_id
         if entity_description.name is not None and self._attr_unique_id is not None:
             self._attr_unique_id += "_" + entity_description.key
+        self._coalescer = coordinator.async_add_coalescer(
+            entity_description.key,
+            entity_description.subsystem,
+            entity_description.set_fn,
+            entity_description.value_fn,
+        )
 
     @property
     def native_value(self) -> float | None:
         """Return the value reported by the number."""
-        return self.entity_description.value_fn(self.coordinator.device)
+        if (value := self._coalescer.value) is not None:
+            return value
+        return self.entity_description.value_fn(self.coordinator.data)
+
+    @property
+    def _discrete_state(self) -> Hashable:
+        # Setting a value writes it optimistically, and the confirmation or
+        # roll back is written as soon as the device echoes it or times out
+        return (*super()._discrete_state, self._coalescer.value)
+
+    @property
+    def _limited_value(self) -> float | None:
+        return self.native_value
 
     async def async_set_native_value(self, value: float) -> None:
         """Set native value."""
-        await self.entity_description.set_fn(self.coordinator.device, value)
-        self.async_schedule_update_ha_state()
+        self._coalescer.async_set(value)
+        # The optimistic value shows right away, see _discrete_state
+        self._async_write_limited()
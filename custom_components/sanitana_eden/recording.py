@@ -0,0 +1,106 @@
+"""Recording of device updates for sanitana_eden."""
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from time import monotonic
+
+from aio_sanitana_eden import SanitanaEden
+from homeassistant.core import HomeAssistant, callback
+
+from .const import LOGGER, RECORDING_BUFFER, RECORDING_FLUSH_INTERVAL
+
+
+class SanitanaEdenRecording:
+    """Stream the updates of a device to a line-delimited JSON file.
+
+    Every update is a line with the seconds since the start of the recording
+    ("t"), the availability ("a") and the state of the device ("s"). Lines are
+    buffered and appended to the file from the executor in batches. While the
+    buffer is full, updates are dropped rather than holding more memory. The
+    file is rotated when it grows beyond its maximum size.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, path: Path, max_bytes: int, backup_count: int
+    ) -> None:
+        """Initialize."""
+        self.hass = hass
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.dropped = 0
+        self._start = monotonic()
+        self._lines: list[str] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._task: asyncio.Task[None] | None = None
+
+    @callback
+    def add(self, device: SanitanaEden) -> None:
+        """Record an update of the device."""
+        if len(self._lines) >= RECORDING_BUFFER:
+            self.dropped += 1
+            return
+        self._lines.append(
+            json.dumps(
+                {
+                    "t": round(monotonic() - self._start, 3),
+                    "a": device.available,
+                    "s": device._state,
+                },
+                separators=(",", ":"),
+            )
+        )
+        if self._timer is None and self._task is None:
+            self._timer = self.hass.loop.call_later(
+                RECORDING_FLUSH_INTERVAL, self._async_start_flush
+            )
+
+    async def async_stop(self) -> None:
+        """Write the buffered updates and stop recording."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if self._task is not None:
+            await self._task
+        await self._async_flush()
+        if self.dropped:
+            LOGGER.warning(
+                "Dropped %d updates recording to %s", self.dropped, self.path
+            )
+
+    @callback
+    def _async_start_flush(self) -> None:
+        self._timer = None
+        self._task = self.hass.async_create_background_task(
+            self._async_flush(), f"Flush recording to {self.path}"
+        )
+
+    async def _async_flush(self) -> None:
+        try:
+            while self._lines:
+                lines, self._lines = self._lines, []
+                await self.hass.async_add_executor_job(self._write, lines)
+        except OSError as exception:
+            LOGGER.error("Failed to write recording to %s: %s", self.path, exception)
+        finally:
+            self._task = None
+
+    def _write(self, lines: list[str]) -> None:
+        data = "".join(f"{line}\n" for line in lines)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        if self.path.exists() and self.path.stat().st_size + len(data) > self.max_bytes:
+            self._rotate()
+        with self.path.open("a", encoding="utf-8") as file:
+            file.write(data)
+
+    def _rotate(self) -> None:
+        for index in range(self.backup_count - 1, 0, -1):
+            source = self.path.with_name(f"{self.path.name}.{index}")
+            if source.exists():
+                source.replace(self.path.with_name(f"{self.path.name}.{index + 1}"))
+        if self.backup_count > 0:
+            self.path.replace(self.path.with_name(f"{self.path.name}.1"))
+        else:
+            self.path.unlink()
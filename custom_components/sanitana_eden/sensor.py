@@ -3,20 +3,29 @@ from __future__ import annotations
 
 from collections.abc import Callable
 from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
 
-from aio_sanitana_eden import SanitanaEden
 from homeassistant.components.sensor import (
+    DOMAIN as SENSOR_DOMAIN,
     SensorEntity,
     SensorEntityDescription,
     SensorDeviceClass,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EntityCategory, UnitOfTime
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.typing import StateType
 
 from .const import DOMAIN
 from .coordinator import SanitanaEdenDataUpdateCoordinator
-from .entity import SanitanaEdenEntity
+from .entity import (
+    SanitanaEdenEntity,
+    SanitanaEdenWritePolicy,
+    async_remove_absent_entities,
+)
+from .stats import SanitanaEdenSamples
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -24,18 +33,145 @@ class SanitanaEdenSensorEntityDescription(SensorEntityDescription):
     """Describes Sanitana Eden sensor entity."""
 
     has_entity_name: bool = True
-    value_fn: Callable[[SanitanaEden], float]
+    subsystem: str
+    value_fn: Callable[[SanitanaEdenDataUpdateCoordinator], StateType | datetime]
+    # The countdown sensors need none, the countdown interval throttles them
+    write_policy: SanitanaEdenWritePolicy | None = None
 
 
 ENTITY_DESCRIPTIONS = (
     SanitanaEdenSensorEntityDescription(
         key="steam_remaining",
+        subsystem="countdown",
         name="Steam Remaining",
         translation_key="steam_remaining",
-        value_fn=lambda device: device.steam.remaining * 100.0,
+        value_fn=lambda coordinator: round(
+            coordinator.steam_countdown.fraction * 100.0, 1
+        ),
         icon="mdi:timer-sand",
         native_unit_of_measurement="%",
     ),
+    SanitanaEdenSensorEntityDescription(
+        key="steam_time_remaining",
+        subsystem="countdown",
+        name="Steam Time Remaining",
+        translation_key="steam_time_remaining",
+        value_fn=lambda coordinator: round(coordinator.steam_countdown.remaining),
+        icon="mdi:timer-sand",
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+    ),
+    SanitanaEdenSensorEntityDescription(
+        key="steam_ends_at",
+        subsystem="countdown",
+        name="Steam Ends At",
+        translation_key="steam_ends_at",
+        value_fn=lambda coordinator: coordinator.steam_countdown.ends_at,
+        device_class=SensorDeviceClass.TIMESTAMP,
+    ),
+)
+
+
+@dataclass(kw_only=True, frozen=True)
+class SanitanaEdenDiagnosticSensorEntityDescription(SensorEntityDescription):
+    """Describes Sanitana Eden diagnostic sensor entity."""
+
+    has_entity_name: bool = True
+    subsystem: str = "diagnostics"
+    entity_category: EntityCategory = EntityCategory.DIAGNOSTIC
+    entity_registry_enabled_default: bool = False
+    value_fn: Callable[[SanitanaEdenDataUpdateCoordinator], StateType]
+    attributes_fn: Callable[
+        [SanitanaEdenDataUpdateCoordinator], dict[str, Any]
+    ] | None = None
+
+
+def _latency_ms(samples: SanitanaEdenSamples, percentile: float) -> float | None:
+    latency = samples.percentile(percentile)
+    return None if latency is None else round(latency * 1000.0, 1)
+
+
+DIAGNOSTIC_ENTITY_DESCRIPTIONS = (
+    SanitanaEdenDiagnosticSensorEntityDescription(
+        key="pushes",
+        name="Pushes",
+        translation_key="pushes",
+        value_fn=lambda coordinator: coordinator.stats.pushes,
+        attributes_fn=lambda coordinator: {
+            "dispatches": coordinator.stats.dispatches,
+            "pushes_per_dispatch": coordinator.stats.pushes_per_dispatch,
+        },
+        icon="mdi:download-network",
+    ),
+    SanitanaEdenDiagnosticSensorEntityDescription(
+        key="state_writes",
+        name="State Writes",
+        translation_key="state_writes",
+        value_fn=lambda coordinator: coordinator.stats.state_writes,
+        icon="mdi:database-edit",
+    ),
+    SanitanaEdenDiagnosticSensorEntityDescription(
+        key="skipped_writes",
+        name="Skipped State Writes",
+        translation_key="skipped_writes",
+        value_fn=lambda coordinator: coordinator.stats.skipped_writes,
+        icon="mdi:database-off",
+    ),
+    SanitanaEdenDiagnosticSensorEntityDescription(
+        key="commands",
+        name="Commands",
+        translation_key="commands",
+        value_fn=lambda coordinator: sum(coordinator.stats.commands.values()),
+        attributes_fn=lambda coordinator: dict(coordinator.stats.commands),
+        icon="mdi:upload-network",
+    ),
+    SanitanaEdenDiagnosticSensorEntityDescription(
+        key="command_latency_p50",
+        name="Command Latency P50",
+        translation_key="command_latency_p50",
+        value_fn=lambda coordinator: _latency_ms(
+            coordinator.stats.command_latency, 50.0
+        ),
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+    ),
+    SanitanaEdenDiagnosticSensorEntityDescription(
+        key="command_latency_p95",
+        name="Command Latency P95",
+        translation_key="command_latency_p95",
+        value_fn=lambda coordinator: _latency_ms(
+            coordinator.stats.command_latency, 95.0
+        ),
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+    ),
+    SanitanaEdenDiagnosticSensorEntityDescription(
+        key="confirm_latency_p95",
+        name="Confirmation Latency P95",
+        translation_key="confirm_latency_p95",
+        value_fn=lambda coordinator: _latency_ms(
+            coordinator.stats.confirm_latency, 95.0
+        ),
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        device_class=SensorDeviceClass.DURATION,
+    ),
+    SanitanaEdenDiagnosticSensorEntityDescription(
+        key="reconnects",
+        name="Reconnects",
+        translation_key="reconnects",
+        value_fn=lambda coordinator: max(coordinator.device.connects - 1, 0),
+        icon="mdi:lan-pending",
+    ),
+    SanitanaEdenDiagnosticSensorEntityDescription(
+        key="last_message_age",
+        name="Last Message Age",
+        translation_key="last_message_age",
+        value_fn=lambda coordinator: None
+        if (age := coordinator.last_message_age) is None
+        else round(age),
+        native_unit_of_measurement=UnitOfTime.SECONDS,
+        device_class=SensorDeviceClass.DURATION,
+    ),
 )
 
 
@@ -45,9 +181,15 @@ async def async_setup_entry(
     """Set up sensor platform."""
 
     coordinator: SanitanaEdenDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_remove_absent_entities(hass, coordinator, SENSOR_DOMAIN, ENTITY_DESCRIPTIONS)
     async_add_entities(
         SanitanaEdenSensorEntity(coordinator, entity_description)
         for entity_description in ENTITY_DESCRIPTIONS
+        if coordinator.has_module(entity_description.subsystem)
+    )
+    async_add_entities(
+        SanitanaEdenDiagnosticSensorEntity(coordinator, entity_description)
+        for entity_description in DIAGNOSTIC_ENTITY_DESCRIPTIONS
     )
 
 
@@ -63,13 +205,59 @@ class SanitanaEdenSensorEntity(SanitanaEdenEntity, SensorEntity):
         entity_description: SanitanaEdenSensorEntityDescription,
     ) -> None:
         """Initialize the sensor class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_description.subsystem)
         self.entity_description = entity_description
+        self._write_policy = entity_description.write_policy
         self._attr_unique_id: str | None = coordinator.config_entry.unique_id
         if entity_description.name is not None and self._attr_unique_id is not None:
             self._attr_unique_id += "_" + entity_description.key
 
     @property
-    def native_value(self) -> float | None:
+    def native_value(self) -> StateType | datetime:
         """Return the value reported by the sensor."""
-        return self.entity_description.value_fn(self.coordinator.device)
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def _limited_value(self) -> float | None:
+        value = self.native_value
+        return value if isinstance(value, int | float) else None
+
+
+class SanitanaEdenDiagnosticSensorEntity(SanitanaEdenEntity, SensorEntity):
+    """Diagnostic SensorEntity for the Sanitana Eden.
+
+    Diagnostic sensors are refreshed periodically by the hub rather than on
+    every push, so they don't add to the state writes they report on.
+    """
+
+    coordinator: SanitanaEdenDataUpdateCoordinator
+    entity_description: SanitanaEdenDiagnosticSensorEntityDescription
+
+    def __init__(
+        self,
+        coordinator: SanitanaEdenDataUpdateCoordinator,
+        entity_description: SanitanaEdenDiagnosticSensorEntityDescription,
+    ) -> None:
+        """Initialize the sensor class."""
+        super().__init__(coordinator, entity_description.subsystem)
+        self.entity_description = entity_description
+        self._attr_unique_id: str | None = coordinator.config_entry.unique_id
+        if self._attr_unique_id is not None:
+            self._attr_unique_id += "_" + entity_description.key
+
+    @property
+    def available(self) -> bool:
+        """Return True, diagnostics are most useful when the device is not."""
+        return True
+
+    @property
+    def native_value(self) -> StateType:
+        """Return the value reported by the sensor."""
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return the state attributes."""
+        if (attributes_fn := self.entity_description.attributes_fn) is None:
+            return None
+        return attributes_fn(self.coordinator)
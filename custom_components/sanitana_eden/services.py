@@ -0,0 +1,136 @@
+"""Services for sanitana_eden."""
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import voluptuous as vol
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, ServiceCall
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import device_registry as dr
+
+from .const import DOMAIN
+from .coordinator import SanitanaEdenDataUpdateCoordinator
+
+ATTR_MAX_SIZE = "max_size"
+ATTR_BACKUP_COUNT = "backup_count"
+
+SERVICE_APPLY_STATE = "apply_state"
+SERVICE_START_RECORDING = "start_recording"
+SERVICE_STOP_RECORDING = "stop_recording"
+
+APPLY_STATE_SCHEMA = vol.Schema(
+    {
+        # Without a target, a call would apply to every device of a site
+        vol.Required(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional("light"): cv.boolean,
+        vol.Optional("light_rgb_color"): vol.All(
+            vol.Coerce(tuple), vol.ExactSequence((cv.byte,) * 3)
+        ),
+        vol.Optional("light_brightness"): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=255)
+        ),
+        vol.Optional("radio"): cv.boolean,
+        vol.Optional("radio_frequency"): vol.All(
+            vol.Coerce(float), vol.Range(min=87.5, max=108.0)
+        ),
+        vol.Optional("radio_volume"): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=63)
+        ),
+        vol.Optional("bluetooth"): cv.boolean,
+        vol.Optional("steam"): cv.boolean,
+        vol.Optional("steam_temperature"): vol.All(
+            vol.Coerce(int), vol.Range(min=35, max=50)
+        ),
+        vol.Optional("steam_duration"): vol.All(
+            vol.Coerce(int), vol.Range(min=10, max=30)
+        ),
+    }
+)
+START_RECORDING_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_MAX_SIZE, default=10): vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=1024)
+        ),
+        vol.Optional(ATTR_BACKUP_COUNT, default=3): vol.All(
+            vol.Coerce(int), vol.Range(min=0, max=100)
+        ),
+    }
+)
+STOP_RECORDING_SCHEMA = vol.Schema(
+    {vol.Optional(ATTR_DEVICE_ID): vol.All(cv.ensure_list, [cv.string])}
+)
+
+
+def _coordinators(
+    hass: HomeAssistant, call: ServiceCall
+) -> list[SanitanaEdenDataUpdateCoordinator]:
+    """Return the coordinators of the devices of a call, all without devices."""
+    coordinators: dict[str, SanitanaEdenDataUpdateCoordinator] = hass.data[DOMAIN]
+    if (device_ids := call.data.get(ATTR_DEVICE_ID)) is None:
+        return list(coordinators.values())
+    device_registry = dr.async_get(hass)
+    return [
+        coordinators[entry_id]
+        for device_id in device_ids
+        if (device := device_registry.async_get(device_id)) is not None
+        for entry_id in device.config_entries
+        if entry_id in coordinators
+    ]
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Set up the services of the integration."""
+    if hass.services.has_service(DOMAIN, SERVICE_APPLY_STATE):
+        return
+
+    async def async_apply_state(call: ServiceCall) -> None:
+        """Bring devices to a desired state."""
+        state = {
+            key: value for key, value in call.data.items() if key != ATTR_DEVICE_ID
+        }
+        await asyncio.gather(
+            *(
+                coordinator.async_apply_state(**state)
+                for coordinator in _coordinators(hass, call)
+            )
+        )
+
+    async def async_start_recording(call: ServiceCall) -> None:
+        """Record the updates of devices to files in the configuration directory."""
+        for coordinator in _coordinators(hass, call):
+            await coordinator.async_start_recording(
+                Path(
+                    hass.config.path(
+                        DOMAIN, f"{coordinator.config_entry.entry_id}.jsonl"
+                    )
+                ),
+                call.data[ATTR_MAX_SIZE] * 1024 * 1024,
+                call.data[ATTR_BACKUP_COUNT],
+            )
+
+    async def async_stop_recording(call: ServiceCall) -> None:
+        """Stop recording the updates of devices."""
+        for coordinator in _coordinators(hass, call):
+            await coordinator.async_stop_recording()
+
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_APPLY_STATE,
+        async_apply_state,
+        schema=APPLY_STATE_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_START_RECORDING,
+        async_start_recording,
+        schema=START_RECORDING_SCHEMA,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_STOP_RECORDING,
+        async_stop_recording,
+        schema=STOP_RECORDING_SCHEMA,
+    )
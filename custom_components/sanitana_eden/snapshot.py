@@ -0,0 +1,117 @@
+"""Device state snapshots for sanitana_eden."""
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from aio_sanitana_eden import SanitanaEden
+
+
+@dataclass(frozen=True, slots=True)
+class SanitanaEdenLightSnapshot:
+    """State of the light."""
+
+    is_on: bool
+    brightness: int
+    rgb_color: tuple[int, int, int]
+
+
+@dataclass(frozen=True, slots=True)
+class SanitanaEdenRadioSnapshot:
+    """State of the radio."""
+
+    is_on: bool
+    frequency: float
+    volume: float
+
+
+@dataclass(frozen=True, slots=True)
+class SanitanaEdenBluetoothSnapshot:
+    """State of bluetooth."""
+
+    is_on: bool
+
+
+@dataclass(frozen=True, slots=True)
+class SanitanaEdenSteamSnapshot:
+    """State of the steam generator.
+
+    The remaining time is published by the steam countdown instead.
+    """
+
+    is_on: bool
+    current_temperature: float
+    temperature: float
+    duration: float
+
+
+@dataclass(frozen=True, slots=True)
+class SanitanaEdenCountdownSnapshot:
+    """State of the steam countdown."""
+
+    is_on: bool
+
+
+@dataclass(frozen=True, slots=True)
+class SanitanaEdenSnapshot:
+    """State of a device, taken once per update for the entities to read.
+
+    Each field holds the state of the subsystem of the same name. Subsystem
+    states equal to those of the previous snapshot are reused, so a subsystem
+    changed if and only if its state is a different object.
+    """
+
+    light: SanitanaEdenLightSnapshot
+    radio: SanitanaEdenRadioSnapshot
+    bluetooth: SanitanaEdenBluetoothSnapshot
+    steam: SanitanaEdenSteamSnapshot
+    countdown: SanitanaEdenCountdownSnapshot
+
+    @classmethod
+    def from_device(
+        cls,
+        device: SanitanaEden,
+        countdown: bool,
+        previous: SanitanaEdenSnapshot | None = None,
+    ) -> SanitanaEdenSnapshot:
+        """Take a snapshot of a device."""
+        light = SanitanaEdenLightSnapshot(
+            device.light.is_on, device.light.brightness, device.light.rgb_color
+        )
+        radio = SanitanaEdenRadioSnapshot(
+            device.radio.is_on, device.radio.frequency, device.radio.volume
+        )
+        bluetooth = SanitanaEdenBluetoothSnapshot(device.bluetooth.is_on)
+        steam = SanitanaEdenSteamSnapshot(
+            device.steam.is_on,
+            device.steam.current_temperature,
+            device.steam.temperature,
+            device.steam.duration,
+        )
+        if previous is None:
+            return cls(
+                light, radio, bluetooth, steam, SanitanaEdenCountdownSnapshot(countdown)
+            )
+        return cls(
+            previous.light if previous.light == light else light,
+            previous.radio if previous.radio == radio else radio,
+            previous.bluetooth if previous.bluetooth == bluetooth else bluetooth,
+            previous.steam if previous.steam == steam else steam,
+            previous.countdown
+            if previous.countdown.is_on == countdown
+            else SanitanaEdenCountdownSnapshot(countdown),
+        )
+
+    def changed(self, previous: SanitanaEdenSnapshot) -> set[str]:
+        """Return the subsystems that changed since a previous snapshot."""
+        changed = set()
+        if self.light is not previous.light:
+            changed.add("light")
+        if self.radio is not previous.radio:
+            changed.add("radio")
+        if self.bluetooth is not previous.bluetooth:
+            changed.add("bluetooth")
+        if self.steam is not previous.steam:
+            changed.add("steam")
+        if self.countdown is not previous.countdown:
+            changed.add("countdown")
+        return changed
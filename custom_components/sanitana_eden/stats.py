@@ -0,0 +1,73 @@
+"""Statistics for sanitana_eden."""
+from __future__ import annotations
+
+from .const import STATS_SAMPLES, SUBSYSTEMS
+
+
+class SanitanaEdenSamples:
+    """Fixed-size ring buffer of the most recent samples of a measurement."""
+
+    __slots__ = ("_samples", "_index", "_count")
+
+    def __init__(self, size: int = STATS_SAMPLES) -> None:
+        """Initialize."""
+        self._samples = [0.0] * size
+        self._index = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of samples."""
+        return self._count
+
+    def add(self, value: float) -> None:
+        """Add a sample, replacing the oldest one when full."""
+        self._samples[self._index] = value
+        self._index = (self._index + 1) % len(self._samples)
+        if self._count < len(self._samples):
+            self._count += 1
+
+    def percentile(self, percentile: float) -> float | None:
+        """Return a percentile (0-100) of the samples, None without samples."""
+        if not self._count:
+            return None
+        samples = sorted(self._samples[: self._count])
+        return samples[min(self._count - 1, int(self._count * percentile / 100.0))]
+
+
+class SanitanaEdenStats:
+    """Counters of the work done by the integration for a device.
+
+    Updating a counter is an integer increment or a write into a preallocated
+    ring buffer, so keeping them costs next to nothing on the hot paths.
+    """
+
+    __slots__ = (
+        "pushes",
+        "dispatches",
+        "state_writes",
+        "skipped_writes",
+        "limited_writes",
+        "commands",
+        "command_latency",
+        "confirm_latency",
+        "unconfirmed_commands",
+    )
+
+    def __init__(self) -> None:
+        """Initialize."""
+        self.pushes = 0
+        self.dispatches = 0
+        self.state_writes = 0
+        self.skipped_writes = 0
+        self.limited_writes = 0
+        self.commands: dict[str, int] = dict.fromkeys(SUBSYSTEMS, 0)
+        self.command_latency = SanitanaEdenSamples()
+        self.confirm_latency = SanitanaEdenSamples()
+        self.unconfirmed_commands = 0
+
+    @property
+    def pushes_per_dispatch(self) -> float | None:
+        """Return the pushes coalesced into each entity update, on average."""
+        if not self.dispatches:
+            return None
+        return round(self.pushes / self.dispatches, 2)
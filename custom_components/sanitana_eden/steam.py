@@ -0,0 +1,456 @@
+"""Steam program countdown for sanitana_eden."""
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta
+from time import monotonic
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    COUNTDOWN_RESYNC,
+    HEATUP_DEFAULT_RATE,
+    HEATUP_DEFAULT_START,
+    HEATUP_LEARNING_RATE,
+    HEATUP_MIN_SPAN,
+    HEATUP_SAMPLE_INTERVAL,
+    HEATUP_SAMPLES,
+    SESSION_LOG_SIZE,
+)
+
+if TYPE_CHECKING:
+    from .coordinator import SanitanaEdenDataUpdateCoordinator
+
+
+class SanitanaEdenSteamCountdown:
+    """Count down the steam program locally.
+
+    The device reports the remaining fraction of the steam program on every
+    push. The countdown anchors the end of the program to those pushes and
+    interpolates in between, so the remaining time is published at a fixed
+    cadence rather than whenever the device happens to push. The end is only
+    moved when a push disagrees by more than the resync tolerance, which keeps
+    the end time stable. Starting and stopping the program are published right
+    away by the coordinator. A program sent again to change its setpoint
+    restarts with the minutes it had left, see async_restart.
+    """
+
+    def __init__(self, coordinator: SanitanaEdenDataUpdateCoordinator) -> None:
+        """Initialize."""
+        self._coordinator = coordinator
+        self.total: float | None = None
+        self.ends_at: datetime | None = None
+        self._end: float | None = None
+        self._fraction = 0.0
+        self._restart: float | None = None
+        self._timer: asyncio.TimerHandle | None = None
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if a steam program is counting down."""
+        return self._end is not None
+
+    @property
+    def remaining(self) -> float:
+        """Return the seconds remaining in the steam program."""
+        if self._end is None:
+            return 0.0
+        return max(self._end - monotonic(), 0.0)
+
+    @property
+    def fraction(self) -> float:
+        """Return the fraction (0.0 to 1.0) of the steam program remaining."""
+        if not self.total:
+            return 0.0
+        return min(self.remaining / self.total, 1.0)
+
+    @callback
+    def async_sync(self) -> None:
+        """Anchor the countdown to the state reported by the device."""
+        steam = self._coordinator.device.steam
+        if not steam.is_on:
+            self.async_stop()
+            return
+        if self.total is None:
+            # The program started, the device only reports a fraction of it
+            self.total = steam.duration * 60.0
+        elif self._restart is not None and steam.remaining > self._fraction:
+            # The fraction only goes up when the program restarted
+            self.total, self._restart = self._restart, None
+        self._fraction = steam.remaining
+        remaining = steam.remaining * self.total
+        now = monotonic()
+        if self._end is None or abs(now + remaining - self._end) > COUNTDOWN_RESYNC:
+            self._end = now + remaining
+            self.ends_at = dt_util.utcnow().replace(microsecond=0) + timedelta(
+                seconds=round(remaining)
+            )
+        if self._timer is None:
+            self._schedule()
+
+    @callback
+    def async_restart(self, minutes: int) -> None:
+        """Expect the program to restart with a new duration in minutes."""
+        self._restart = minutes * 60.0
+
+    @callback
+    def async_stop(self) -> None:
+        """Stop the countdown."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self.total = None
+        self.ends_at = None
+        self._end = None
+        self._fraction = 0.0
+        self._restart = None
+
+    def _schedule(self) -> None:
+        self._timer = self._coordinator.hass.loop.call_later(
+            self._coordinator.countdown_interval, self._async_publish
+        )
+
+    @callback
+    def _async_publish(self) -> None:
+        self._timer = None
+        self._coordinator.async_update_listeners_for({"countdown"})
+        if self.is_on:
+            self._schedule()
+
+
+class SanitanaEdenHeatUpModel:
+    """Model of how fast the steam generator heats the cabin.
+
+    During a steam session the temperatures reported by the device are kept in
+    a fixed-size ring buffer until the target is reached, and a straight line
+    fitted through them gives the heating rate. The device pushes every few
+    seconds while steaming but reports whole degrees, so a temperature is only
+    kept when it changed or the sample interval passed. The buffer then spans
+    enough of the session to measure slow rates too. Every session long enough to
+    measure updates a learned heating rate and starting temperature, which
+    predict how long before a given time steam has to start to be at
+    temperature by then. Rates are in degrees Celsius per minute.
+    """
+
+    __slots__ = (
+        "rate",
+        "start_temperature",
+        "_times",
+        "_temperatures",
+        "_index",
+        "_count",
+        "_first",
+        "_reached",
+    )
+
+    def __init__(self, size: int = HEATUP_SAMPLES) -> None:
+        """Initialize."""
+        self.rate: float | None = None
+        self.start_temperature: float | None = None
+        self._times = [0.0] * size
+        self._temperatures = [0.0] * size
+        self._index = 0
+        self._count = 0
+        self._first: float | None = None
+        self._reached = False
+
+    @property
+    def session_rate(self) -> float | None:
+        """Return the heating rate of the current session, if measured yet."""
+        count = self._count
+        if count < 2:
+            return None
+        times = self._times[:count]
+        temperatures = self._temperatures[:count]
+        start = min(times)
+        if max(times) - start < HEATUP_MIN_SPAN:
+            return None
+        # Least squares slope, in minutes to keep the numbers small
+        minutes = [(time - start) / 60.0 for time in times]
+        mean_minutes = sum(minutes) / count
+        mean_temperature = sum(temperatures) / count
+        variance = sum((minute - mean_minutes) ** 2 for minute in minutes)
+        if variance == 0.0:
+            return None
+        covariance = sum(
+            (minute - mean_minutes) * (temperature - mean_temperature)
+            for minute, temperature in zip(minutes, temperatures)
+        )
+        rate = covariance / variance
+        return rate if rate > 0.0 else None
+
+    @property
+    def heating_rate(self) -> float | None:
+        """Return the rate of the current session, or the learned rate."""
+        if not self._reached and (rate := self.session_rate) is not None:
+            return rate
+        return self.rate
+
+    def time_to_target(self, temperature: float, target: float) -> float | None:
+        """Return the minutes until the target is reached, None if unknown."""
+        if temperature >= target:
+            return 0.0
+        if (rate := self.heating_rate) is None:
+            return None
+        return (target - temperature) / rate
+
+    def lead_time(self, target: float) -> float:
+        """Return the minutes steam needs to reach a target from cold."""
+        start = self.start_temperature or HEATUP_DEFAULT_START
+        return max(target - start, 0.0) / (self.rate or HEATUP_DEFAULT_RATE)
+
+    def update(
+        self, is_on: bool, temperature: float, target: float, now: float
+    ) -> None:
+        """Add a temperature reported by the device."""
+        if not is_on:
+            if self._first is not None:
+                self._learn()
+                self._reset()
+            return
+        if self._reached:
+            return
+        if self._first is None:
+            self._first = temperature
+        elif (
+            temperature == self._temperatures[self._index - 1]
+            and now - self._times[self._index - 1] < HEATUP_SAMPLE_INTERVAL
+            and temperature < target
+        ):
+            return
+        self._times[self._index] = now
+        self._temperatures[self._index] = temperature
+        self._index = (self._index + 1) % len(self._times)
+        if self._count < len(self._times):
+            self._count += 1
+        if temperature >= target:
+            self._learn()
+            self._reached = True
+
+    def dump(self) -> dict[str, float | None]:
+        """Return the learned model to persist."""
+        return {"rate": self.rate, "start_temperature": self.start_temperature}
+
+    def restore(self, data: dict[str, float | None]) -> None:
+        """Restore a persisted learned model."""
+        self.rate = data.get("rate")
+        self.start_temperature = data.get("start_temperature")
+
+    def _learn(self) -> None:
+        if self._reached or (rate := self.session_rate) is None:
+            return
+        self.rate = _moving_average(self.rate, rate)
+        self.start_temperature = _moving_average(self.start_temperature, self._first)
+
+    def _reset(self) -> None:
+        self._index = 0
+        self._count = 0
+        self._first = None
+        self._reached = False
+
+
+class SanitanaEdenSteamUsage(NamedTuple):
+    """Steam usage in an hour, with the totals up to and including it."""
+
+    start: int
+    sessions: int
+    minutes: float
+    setpoint: float | None
+    total_sessions: int
+    total_minutes: float
+
+
+class SanitanaEdenSteamSessionLog:
+    """Log of the steam sessions of a device.
+
+    A session runs from steam being turned on until it is turned off. The most
+    recent sessions are kept as (start, minutes, setpoint, duration) tuples,
+    where the setpoint is averaged over the minutes at it and the duration is
+    the programmed one. Usage is also added up per hour: the sessions started,
+    the minutes of steam and the setpoint weighted by those minutes. Hours
+    that are over are taken out in a batch, see pop_hours, to be imported into
+    the long-term statistics. Times are UTC timestamps.
+
+    Only time the device was seen steaming counts. Accounting is paused while
+    the device is unavailable, a session still open when Home Assistant stops
+    is closed where it was last seen, and a session never counts more minutes
+    than programmed.
+    """
+
+    __slots__ = (
+        "sessions",
+        "total_sessions",
+        "total_minutes",
+        "_start",
+        "_segment",
+        "_seen",
+        "_setpoint",
+        "_duration",
+        "_minutes",
+        "_degree_minutes",
+        "_hours",
+    )
+
+    def __init__(self, size: int = SESSION_LOG_SIZE) -> None:
+        """Initialize."""
+        self.sessions: deque[tuple[float, float, float, int]] = deque(maxlen=size)
+        # Totals of the hours taken out so far
+        self.total_sessions = 0
+        self.total_minutes = 0.0
+        self._start: float | None = None
+        # Accounted up to here, None while paused
+        self._segment: float | None = None
+        # Last seen steaming
+        self._seen = 0.0
+        self._setpoint = 0.0
+        self._duration = 0
+        self._minutes = 0.0
+        self._degree_minutes = 0.0
+        # Start of the hour: sessions, minutes, setpoint times minutes
+        self._hours: dict[int, list[float]] = {}
+
+    @property
+    def is_on(self) -> bool:
+        """Return True if a session is running."""
+        return self._start is not None
+
+    def update(self, is_on: bool, setpoint: float, duration: int, now: float) -> None:
+        """Follow the steam state reported by the device."""
+        if self._start is None:
+            if is_on:
+                self._start = self._segment = self._seen = now
+                self._setpoint = setpoint
+                self._duration = duration
+                self._hour(now)[0] += 1
+            return
+        if self._segment is None:
+            # The time the device was unavailable doesn't count
+            self._segment = now
+        if not is_on:
+            self._close(now)
+            return
+        self._seen = now
+        if setpoint != self._setpoint or duration != self._duration:
+            self._account(now)
+            self._setpoint = setpoint
+            self._duration = duration
+
+    def pause(self, now: float) -> None:
+        """Stop accounting until the device reports again."""
+        if self._start is not None and self._segment is not None:
+            self._account(now)
+            self._seen = now
+            self._segment = None
+
+    def pop_hours(self, now: float) -> list[SanitanaEdenSteamUsage]:
+        """Take out the hours that are over, oldest first.
+
+        A running session is accounted up to the start of the current hour.
+        """
+        current = int(now - now % 3600)
+        if self._segment is not None and self._segment < current:
+            self._account(current)
+        hours = []
+        for hour in sorted(self._hours):
+            if hour >= current:
+                break
+            sessions, minutes, degree_minutes = self._hours.pop(hour)
+            self.total_sessions += sessions
+            self.total_minutes += minutes
+            hours.append(
+                SanitanaEdenSteamUsage(
+                    hour,
+                    sessions,
+                    round(minutes, 2),
+                    round(degree_minutes / minutes, 1) if minutes else None,
+                    self.total_sessions,
+                    round(self.total_minutes, 2),
+                )
+            )
+        return hours
+
+    def dump(self) -> dict[str, Any]:
+        """Return the log to persist."""
+        return {
+            "total_sessions": self.total_sessions,
+            "total_minutes": self.total_minutes,
+            "sessions": list(self.sessions),
+            "session": None
+            if self._start is None
+            else {
+                "start": self._start,
+                "segment": self._segment,
+                "seen": self._seen,
+                "setpoint": self._setpoint,
+                "duration": self._duration,
+                "minutes": self._minutes,
+                "degree_minutes": self._degree_minutes,
+            },
+            "hours": self._hours,
+        }
+
+    def restore(self, data: dict[str, Any]) -> None:
+        """Restore a persisted log, closing a session that was still open."""
+        self.total_sessions = data.get("total_sessions", 0)
+        self.total_minutes = data.get("total_minutes", 0.0)
+        self.sessions.extend(tuple(session) for session in data.get("sessions", []))
+        # JSON turned the hours into strings
+        self._hours = {
+            int(hour): usage for hour, usage in data.get("hours", {}).items()
+        }
+        if session := data.get("session"):
+            self._start = session["start"]
+            self._segment = session["segment"]
+            self._seen = session["seen"]
+            self._setpoint = session["setpoint"]
+            self._duration = session["duration"]
+            self._minutes = session["minutes"]
+            self._degree_minutes = session["degree_minutes"]
+            self._close(self._seen)
+
+    def _hour(self, time: float) -> list[float]:
+        hour = int(time - time % 3600)
+        if (usage := self._hours.get(hour)) is None:
+            usage = self._hours[hour] = [0, 0.0, 0.0]
+        return usage
+
+    def _close(self, until: float) -> None:
+        if self._segment is not None:
+            self._account(until)
+        self.sessions.append(
+            (
+                self._start,
+                round(self._minutes, 2),
+                round(self._degree_minutes / self._minutes, 1)
+                if self._minutes
+                else self._setpoint,
+                self._duration,
+            )
+        )
+        self._start = self._segment = None
+        self._minutes = self._degree_minutes = 0.0
+
+    def _account(self, until: float) -> None:
+        """Add the minutes since the last change, split over the hours."""
+        start = self._segment
+        # Steam stops once the programmed duration is over
+        end_of_program = start + max(self._duration - self._minutes, 0.0) * 60.0
+        while start < min(until, end_of_program):
+            end = min(until, end_of_program, start - start % 3600 + 3600)
+            minutes = (end - start) / 60.0
+            usage = self._hour(start)
+            usage[1] += minutes
+            usage[2] += minutes * self._setpoint
+            self._minutes += minutes
+            self._degree_minutes += minutes * self._setpoint
+            start = end
+        self._segment = max(until, self._segment)
+
+
+def _moving_average(average: float | None, value: float | None) -> float | None:
+    if average is None or value is None:
+        return value if average is None else average
+    return average + HEATUP_LEARNING_RATE * (value - average)
@@ -5,14 +5,19 @@ from collections.abc import Awaitable, Callable
 from dataclasses import dataclass
 
 from aio_sanitana_eden import SanitanaEden
-from homeassistant.components.switch import SwitchEntity, SwitchEntityDescription
+from homeassistant.components.switch import (
+    DOMAIN as SWITCH_DOMAIN,
+    SwitchEntity,
+    SwitchEntityDescription,
+)
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import COMMAND_PRIORITY_SWITCH, DOMAIN
 from .coordinator import SanitanaEdenDataUpdateCoordinator
-from .entity import SanitanaEdenEntity
+from .entity import SanitanaEdenEntity, async_remove_absent_entities
+from .snapshot import SanitanaEdenSnapshot
 
 
 @dataclass(kw_only=True, frozen=True)
@@ -20,7 +25,8 @@ class SanitanaEdenSwitchEntityDescription(SwitchEntityDescription):
     """Describes Sanitana Eden switch entity."""
 
     has_entity_name: bool = True
-    value_fn: Callable[[SanitanaEden], bool]
+    subsystem: str
+    value_fn: Callable[[SanitanaEdenSnapshot], bool]
     turn_on_fn: Callable[[SanitanaEden], Awaitable[None]]
     turn_off_fn: Callable[[SanitanaEden], Awaitable[None]]
 
@@ -28,18 +34,20 @@ class SanitanaEdenSwitchEntityDescription(SwitchEntityDescription):
 ENTITY_DESCRIPTIONS = (
     SanitanaEdenSwitchEntityDescription(
         key="radio",
+        subsystem="radio",
         name="Radio",
         translation_key="radio",
-        value_fn=lambda device: device.radio.is_on,
+        value_fn=lambda data: data.radio.is_on,
         turn_on_fn=lambda device: device.radio.async_turn_on(),
         turn_off_fn=lambda device: device.radio.async_turn_off(),
         icon="mdi:radio",
     ),
     SanitanaEdenSwitchEntityDescription(
         key="bluetooth",
+        subsystem="bluetooth",
         name="Bluetooth",
         translation_key="bluetooth",
-        value_fn=lambda device: device.bluetooth.is_on,
+        value_fn=lambda data: data.bluetooth.is_on,
         turn_on_fn=lambda device: device.bluetooth.async_turn_on(),
         turn_off_fn=lambda device: device.bluetooth.async_turn_off(),
         icon="mdi:bluetooth",
@@ -53,9 +61,11 @@ async def async_setup_entry(
     """Set up switch platform."""
 
     coordinator: SanitanaEdenDataUpdateCoordinator = hass.data[DOMAIN][entry.entry_id]
+    async_remove_absent_entities(hass, coordinator, SWITCH_DOMAIN, ENTITY_DESCRIPTIONS)
     async_add_entities(
         SanitanaEdenSwitchEntity(coordinator, entity_description)
         for entity_description in ENTITY_DESCRIPTIONS
+        if coordinator.has_module(entity_description.subsystem)
     )
 
 
@@ -71,7 +81,7 @@ class SanitanaEdenSwitchEntity(SanitanaEdenEntity, SwitchEntity):
         entity_description: SanitanaEdenSwitchEntityDescription,
     ) -> None:
         """Initialize the switch class."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, entity_description.subsystem)
         self.entity_description = entity_description
         self._attr_unique_id: str | None = coordinator.config_entry.unique_id
         if entity_description.name is not None and self._attr_unique_id is not None:
@@ -80,14 +90,24 @@ class SanitanaEdenSwitchEntity(SanitanaEdenEntity, SwitchEntity):
     @property
     def is_on(self) -> bool:
         """Return True if entity is on."""
-        return self.entity_description.value_fn(self.coordinator.device)
+        return self.entity_description.value_fn(self.coordinator.data)
 
     async def async_turn_on(self, **_) -> None:
         """Turn on switch."""
-        await self.entity_description.turn_on_fn(self.coordinator.device)
-        # await self.coordinator.async_request_refresh()
+        await self.coordinator.async_send_command(
+            self.entity_description.subsystem,
+            self.entity_description.key,
+            self.entity_description.turn_on_fn,
+            COMMAND_PRIORITY_SWITCH,
+            confirm=self.entity_description.value_fn,
+        )
 
     async def async_turn_off(self, **_) -> None:
         """Turn off switch."""
-        await self.entity_description.turn_off_fn(self.coordinator.device)
-        # await self.coordinator.async_request_refresh()
+        await self.coordinator.async_send_command(
+            self.entity_description.subsystem,
+            self.entity_description.key,
+            self.entity_description.turn_off_fn,
+            COMMAND_PRIORITY_SWITCH,
+            confirm=lambda data: not self.entity_description.value_fn(data),
+        )
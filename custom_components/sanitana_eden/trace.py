@@ -0,0 +1,61 @@
+"""Protocol trace for sanitana_eden."""
+from __future__ import annotations
+
+from time import monotonic
+from typing import Any
+
+from .const import TRACE_SIZE
+
+# Messages start with "@" and the MAC addresses, the command follows
+_PAYLOAD = 35
+
+
+class SanitanaEdenTrace:
+    """Fixed-size ring buffer of the most recent messages to and from a device.
+
+    Adding a message stores a timestamp and a reference to the message bytes
+    in preallocated slots, so tracing allocates nothing per message. Messages
+    are only decoded when the trace is read.
+    """
+
+    __slots__ = ("_times", "_outbound", "_messages", "_index", "_count")
+
+    def __init__(self, size: int = TRACE_SIZE) -> None:
+        """Initialize."""
+        self._times = [0.0] * size
+        self._outbound = [False] * size
+        self._messages = [b""] * size
+        self._index = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of messages."""
+        return self._count
+
+    def add(self, outbound: bool, message: bytes) -> None:
+        """Add a message, replacing the oldest one when full."""
+        index = self._index
+        self._times[index] = monotonic()
+        self._outbound[index] = outbound
+        self._messages[index] = message
+        self._index = (index + 1) % len(self._times)
+        if self._count < len(self._times):
+            self._count += 1
+
+    def as_list(self) -> list[dict[str, Any]]:
+        """Return the messages, oldest first, without the MAC addresses."""
+        size = len(self._times)
+        now = monotonic()
+        return [
+            {
+                "age": round(now - self._times[index], 3),
+                "direction": "out" if self._outbound[index] else "in",
+                "message": self._messages[index][_PAYLOAD:]
+                .rstrip(b"*&\r\n")
+                .decode(errors="replace"),
+            }
+            for index in (
+                (self._index - self._count + offset) % size
+                for offset in range(self._count)
+            )
+        ]
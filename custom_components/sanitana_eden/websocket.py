@@ -0,0 +1,163 @@
+"""Websocket API for sanitana_eden."""
+from __future__ import annotations
+
+import asyncio
+from time import monotonic
+from typing import Any
+
+import voluptuous as vol
+from homeassistant.components import websocket_api
+from homeassistant.const import ATTR_DEVICE_ID
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DATA_WEBSOCKET, DOMAIN, SIGNAL_TELEMETRY, TELEMETRY_MIN_INTERVAL
+from .coordinator import SanitanaEdenDataUpdateCoordinator
+
+ATTR_INTERVAL = "interval"
+
+
+@callback
+def async_setup_websocket_api(hass: HomeAssistant) -> None:
+    """Set up the websocket API of the integration."""
+    if hass.data.get(DATA_WEBSOCKET):
+        return
+    hass.data[DATA_WEBSOCKET] = True
+    websocket_api.async_register_command(hass, websocket_subscribe)
+
+
+def telemetry(coordinator: SanitanaEdenDataUpdateCoordinator) -> dict[str, Any]:
+    """Return the live values of a device, keyed compactly."""
+    device = coordinator.device
+    state = device._state
+    return {
+        "available": coordinator.available,
+        "light": (state.light_red, state.light_green, state.light_blue),
+        "radio": (state.radio_on, state.radio_frequency, state.radio_volume),
+        "bluetooth": state.bluetooth_on,
+        "steam": device.steam.is_on,
+        "temperature": device.steam.current_temperature,
+        "target": device.steam.temperature,
+        "remaining": round(coordinator.steam_countdown.remaining, 1),
+    }
+
+
+class SanitanaEdenTelemetrySubscription:
+    """Stream the changes of a device to a websocket subscriber.
+
+    Each event holds the values that changed since the previous one, the first
+    holds them all. Events are sent at most once per interval. Updates in
+    between are merged into the next event, so a subscriber only ever has one
+    event pending and a slow or high-rate view never builds up a backlog.
+
+    The subscription follows the config entry of the device. While the entry
+    is unloaded, the device shows as unavailable, and once it is set up again
+    the events carry on from the new coordinator.
+    """
+
+    def __init__(
+        self,
+        hass: HomeAssistant,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        entry_id: str,
+        interval: float,
+    ) -> None:
+        """Initialize."""
+        self._hass = hass
+        self._connection = connection
+        self._msg_id = msg_id
+        self._entry_id = entry_id
+        self._interval = interval
+        self._sent: dict[str, Any] = {}
+        self._sent_at = 0.0
+        self._timer: asyncio.TimerHandle | None = None
+
+    @callback
+    def async_update(self) -> None:
+        """Send the changes, or schedule them if an event was sent recently."""
+        if self._timer is not None:
+            return
+        if (delay := self._sent_at + self._interval - monotonic()) > 0:
+            self._timer = self._hass.loop.call_later(delay, self._async_send)
+        else:
+            self._async_send()
+
+    @callback
+    def async_cancel(self) -> None:
+        """Stop sending events."""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    @callback
+    def _async_send(self) -> None:
+        self._timer = None
+        coordinator: SanitanaEdenDataUpdateCoordinator | None = self._hass.data.get(
+            DOMAIN, {}
+        ).get(self._entry_id)
+        values = {"available": False} if coordinator is None else telemetry(coordinator)
+        changes = {
+            key: value
+            for key, value in values.items()
+            if key not in self._sent or self._sent[key] != value
+        }
+        if not changes:
+            return
+        self._sent.update(changes)
+        self._sent_at = monotonic()
+        self._connection.send_message(
+            websocket_api.event_message(self._msg_id, changes)
+        )
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Required(ATTR_DEVICE_ID): str,
+        vol.Optional(ATTR_INTERVAL, default=TELEMETRY_MIN_INTERVAL): vol.All(
+            vol.Coerce(float), vol.Range(min=TELEMETRY_MIN_INTERVAL, max=60.0)
+        ),
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Subscribe to the live values of a device."""
+    coordinators: dict[str, SanitanaEdenDataUpdateCoordinator] = hass.data.get(
+        DOMAIN, {}
+    )
+    device = dr.async_get(hass).async_get(msg[ATTR_DEVICE_ID])
+    entry_id = next(
+        (
+            entry_id
+            for entry_id in (device.config_entries if device else ())
+            if entry_id in coordinators
+        ),
+        None,
+    )
+    if entry_id is None:
+        connection.send_error(
+            msg["id"], websocket_api.const.ERR_NOT_FOUND, "Device not found"
+        )
+        return
+
+    subscription = SanitanaEdenTelemetrySubscription(
+        hass, connection, msg["id"], entry_id, msg[ATTR_INTERVAL]
+    )
+    remove_listener = async_dispatcher_connect(
+        hass, SIGNAL_TELEMETRY.format(entry_id), subscription.async_update
+    )
+
+    @callback
+    def async_unsubscribe() -> None:
+        remove_listener()
+        subscription.async_cancel()
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    connection.send_result(msg["id"])
+    subscription.async_update()